@@ -0,0 +1,105 @@
+import argparse
+import sys
+import time
+from bench import POSITIONS
+from core.backends import BACKENDS
+from core.batch import numpy
+from core.board import Board
+from core.bitboard import BitBoard
+from core.engine import Engine
+
+
+def collect_frontier(board: Board | BitBoard, depth: int, frontier: list) -> None:
+    # the positions one move above the frontier, with the moves that reach it
+    moves = board.get_legal_moves()
+    if depth == 1:
+        frontier.append((board.copy(), moves))
+        return
+
+    for move in moves:
+        board.push(move)
+        collect_frontier(board, depth - 1, frontier)
+        board.pop()
+
+
+def evaluate_incremental(engine: Engine, frontier: list) -> list[int]:
+    # make each move and read the score the board keeps, as the search does
+    scores = []
+    for board, moves in frontier:
+        for move in moves:
+            board.push(move)
+            scores.append(engine.evaluate(board))
+            board.pop()
+
+    return scores
+
+
+def evaluate_each(engine: Engine, frontier: list) -> list[int]:
+    # score the children of one position at a time
+    scores = []
+    for board, moves in frontier:
+        scores.extend(engine.evaluate_children(board, moves))
+
+    return scores
+
+
+def time_method(method, runs: int) -> tuple[float, list[int]]:
+    # the best of several runs, to ignore anything else slowing down the machine
+    best = float("inf")
+    for run in range(runs):
+        start_time = time.perf_counter()
+        scores = method()
+        best = min(best, time.perf_counter() - start_time)
+
+    return best, scores
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Check and time scoring the frontier of the bench positions."
+    )
+    parser.add_argument("--depth", type=int, default=2)
+    parser.add_argument("--backend", choices=BACKENDS, default="list")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    if args.depth < 1:
+        parser.error("--depth has to be at least 1")
+
+    engine = Engine(verbose=False)
+    frontier = []
+    for fen in POSITIONS:
+        collect_frontier(BACKENDS[args.backend].from_fen(fen), args.depth, frontier)
+
+    # every way is timed from the boards and moves, including any encoding
+    methods = {
+        "Incremental": lambda: evaluate_incremental(engine, frontier),
+        "Children": lambda: evaluate_each(engine, frontier),
+        "Frontier": lambda: engine.evaluate_frontier(frontier, vectorized=False),
+    }
+    if numpy is not None:
+        methods["Frontier NumPy"] = lambda: engine.evaluate_frontier(frontier)
+
+    results = {name: time_method(method, args.runs) for name, method in methods.items()}
+    expected = results["Incremental"][1]
+    print(f"Frontier Nodes: {len(frontier)}, Leaves: {len(expected)}")
+
+    # every way of scoring has to agree with the scores kept by the board
+    failed = [name for name, (seconds, scores) in results.items() if scores != expected]
+    if failed:
+        print(f"Parity FAILED for {', '.join(failed)}")
+        sys.exit(1)
+    print(f"Parity: {', '.join(results)} scores match")
+
+    base_time = results["Incremental"][0]
+    for name, (seconds, scores) in results.items():
+        print(
+            f"{name}: {round(len(expected) / max(seconds, 1e-9))} evals per second, "
+            f"{round(base_time / max(seconds, 1e-9), 2)}x incremental"
+        )
+
+    if numpy is None:
+        print("NumPy isn't installed, so only the scalar scores were checked")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+import argparse
+import json
+import sys
+import time
+from core.backends import BACKENDS
+from core.engine import Engine
+from core.instrument import Profiler
+
+# openings, middlegames, tactics and endgames, searched in this order
+POSITIONS = [
+    "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+    "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+    "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+    "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+    "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+    "r1bqkbnr/1ppp1ppp/p1n5/1B2p3/4P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 0 4",
+    "r1bqk1nr/pppp1ppp/2n5/2b1p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4",
+    "rnbqkb1r/1p2pppp/p2p1n2/8/3NP3/2N5/PPP2PPP/R1BQKB1R w KQkq - 0 6",
+    "rnbqkb1r/ppp2ppp/4pn2/3p4/3PP3/2N5/PPP2PPP/R1BQKBNR w KQkq - 2 4",
+    "rnbqk2r/ppp1ppbp/3p1np1/8/2PPP3/2N5/PP3PPP/R1BQKBNR w KQkq - 0 5",
+    "rnbqk2r/pppp1ppp/4pn2/8/1bPP4/2N5/PP2PPPP/R1BQKBNR w KQkq - 2 4",
+    "r1bqkb1r/pppp1ppp/2n2n2/4p3/2P5/2N2N2/PP1PPPPP/R1BQKB1R w KQkq - 4 4",
+    "r1bq1rk1/pp2bppp/2n1pn2/3p4/2PP4/2N1PN2/PP2BPPP/R2QKB1R w KQ - 0 8",
+    "2rr3k/pp3pp1/1nnqbN1p/3pN3/2pP4/2P3Q1/PP3PPP/R4RK1 w - - 0 1",
+    "8/7p/5k2/5p2/p1p2P2/Pr1pPK2/1P1R3P/8 b - - 0 1",
+    "5rk1/1ppb3p/p1pb4/6q1/3P1p1r/2P1R2P/PP1BQ1P1/5RKR b - - 0 1",
+    "r1bq2rk/pp3pbp/2p1p1pQ/7P/3P4/2PB1N2/PP3PPR/2KR4 w - - 0 1",
+    "7k/p7/1R5K/6r1/6p1/6P1/8/8 w - - 0 1",
+    "rnbqkb1r/pppp1ppp/8/4P3/6n1/7P/PPPNPPP1/R1BQKBNR b KQkq - 0 1",
+    "r4q1k/p2bR1rp/2p2Q1N/5p2/5p2/2P5/PP3PPP/R5K1 w - - 0 1",
+    "3q1rk1/p4pp1/2pb3p/3p4/6Pr/1PNQ4/P1PB1PP1/4RRK1 b - - 0 1",
+    "2br2k1/2q3rn/p2NppQ1/2p1P3/Pp5R/4P3/1P3PPP/3R2K1 w - - 0 1",
+    "6k1/5ppp/8/8/8/8/5PPP/3R2K1 w - - 0 1",
+    "8/pp3k2/2p5/3p4/3P4/2P5/PP3K2/8 w - - 0 1",
+    "8/8/1p1k4/1P6/2K5/8/8/8 w - - 0 1",
+    "8/8/8/4k3/8/8/4P3/4K3 w - - 0 1",
+    "4k3/8/8/8/8/8/8/4K2R w K - 0 1",
+    "8/5pk1/6p1/8/4R3/6P1/5PK1/3r4 w - - 0 1",
+    "2k5/8/8/8/8/8/3QK3/8 w - - 0 1",
+]
+
+
+def run_bench(depth: int, backend: str) -> tuple[int, float]:
+    nodes = 0
+    elapsed = 0.0
+
+    for number, fen in enumerate(POSITIONS, 1):
+        # a new engine for each position, so the result doesn't depend on the order
+        engine = Engine(verbose=False)
+        board = BACKENDS[backend].from_fen(fen)
+
+        # no time limit, so the same depth always searches the same nodes
+        start_time = time.perf_counter()
+        engine.search(board, max_time=float("inf"), max_depth=depth)
+        seconds = time.perf_counter() - start_time
+        engine.close()
+
+        nodes += engine.nodes
+        elapsed += seconds
+        print(f"Position {number}/{len(POSITIONS)}: {engine.nodes} nodes")
+
+    return nodes, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Search a fixed set of positions to a fixed depth."
+    )
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--backend", choices=BACKENDS, default="list")
+    parser.add_argument("--save", help="write the result as a baseline to this file")
+    parser.add_argument("--baseline", help="compare against a saved baseline")
+    parser.add_argument(
+        "--threshold", type=float, default=0.1, help="the largest nps drop allowed"
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="profile.folded",
+        help="time each phase and write a flame graph to this file",
+    )
+    args = parser.parse_args()
+
+    # the timing slows the search, so a profiled run can't be or use a baseline
+    if args.profile and args.baseline:
+        parser.error("--profile can't be used with --baseline")
+    if args.profile and args.save:
+        parser.error("--profile can't be used with --save")
+
+    profiler = Profiler() if args.profile else None
+    if profiler:
+        profiler.start()
+
+    nodes, elapsed = run_bench(args.depth, args.backend)
+
+    if profiler:
+        profiler.stop()
+        print(f"\n{profiler.report()}")
+        profiler.write_flamegraph(args.profile)
+    nps = round(nodes / max(elapsed, 1e-9))
+
+    # the node count changes only when the search itself changes
+    print(f"\nNodes: {nodes}")
+    print(f"Time: {round(elapsed, 3)}s")
+    print(f"Nodes per Second: {nps}")
+
+    result = {"depth": args.depth, "backend": args.backend, "nodes": nodes, "nps": nps}
+    if args.save:
+        with open(args.save, "w") as file:
+            json.dump(result, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+
+        if (baseline["depth"], baseline["backend"]) != (args.depth, args.backend):
+            print(
+                f"The baseline is for depth {baseline['depth']} "
+                f"with the {baseline['backend']} backend"
+            )
+            sys.exit(1)
+
+        if nodes == baseline["nodes"]:
+            print("Nodes match the baseline, the search is unchanged")
+        else:
+            print(f"Nodes differ from the baseline's {baseline['nodes']}")
+            print("The search has changed, not only its speed")
+
+        # fail if the speed dropped by more than the threshold
+        change = nps / baseline["nps"] - 1
+        print(f"Speed Change: {round(change * 100, 1)}%")
+        if change < -args.threshold:
+            print("Bench FAILED")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
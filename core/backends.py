@@ -0,0 +1,5 @@
+from core.board import Board
+from core.bitboard import BitBoard
+
+# the board representations the engine and game can use
+BACKENDS = {"list": Board, "bitboard": BitBoard}
@@ -0,0 +1,130 @@
+from core.board import Board
+from core.bitboard import BitBoard
+from core.move import Move, KING_CASTLE, QUEEN_CASTLE, EN_PASSANT, PROMOTION, FLAG_MASK
+from core.piecetables import MATERIAL, POSITION
+
+# numpy is optional, without it the moves are scored one at a time
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# the number stored for each piece in an encoded board, with 0 for an empty square
+PIECES = "PNBRQKpnbrqk"
+PIECE_CODES = {"": 0} | {piece: code for code, piece in enumerate(PIECES, 1)}
+
+# the material and position value of each piece code on each square, from white's view
+SCORES = [[0] * 64] + [
+    [MATERIAL[piece] + POSITION[piece][square // 8][square % 8] for square in range(64)]
+    for piece in PIECES
+]
+
+if numpy is not None:
+    SCORE_TABLE = numpy.array(SCORES, dtype=numpy.int32)
+
+
+def encode_board(board: Board | BitBoard) -> bytes:
+    # one byte with the piece code of each square, from a8 to h1
+    return bytes([PIECE_CODES[piece] for rank in board.board for piece in rank])
+
+
+def encode_node(
+    board: Board | BitBoard, moves: list[Move]
+) -> tuple[int, bytes, list[int]]:
+    # everything needed to score the children without making the moves
+    return (
+        board.material + board.position,
+        encode_board(board),
+        [move.code for move in moves],
+    )
+
+
+def score_moves_scalar(nodes: list[tuple[int, bytes, list[int]]]) -> list[int]:
+    scores = []
+    for score, squares, codes in nodes:
+        for code in codes:
+            old_square = code & 63
+            new_square = code >> 6 & 63
+            flags = code & FLAG_MASK
+            piece = squares[old_square]
+
+            # take the piece off its square and whatever it captures off the board
+            child = score - SCORES[piece][old_square]
+            child -= SCORES[squares[new_square]][new_square]
+            if flags == EN_PASSANT:
+                captured_square = old_square & 56 | new_square & 7
+                child -= SCORES[squares[captured_square]][captured_square]
+
+            # the promoted piece is numbered like the pawn's colour
+            if code & PROMOTION:
+                piece = 2 + (code >> 12 & 3) + (6 if piece > 6 else 0)
+
+            # castling moves the rook as well
+            elif flags == KING_CASTLE or flags == QUEEN_CASTLE:
+                if flags == KING_CASTLE:
+                    rook_old, rook_new = old_square + 3, old_square + 1
+                else:
+                    rook_old, rook_new = old_square - 4, old_square - 1
+                rook = squares[rook_old]
+                child += SCORES[rook][rook_new] - SCORES[rook][rook_old]
+
+            scores.append(child + SCORES[piece][new_square])
+
+    return scores
+
+
+def score_moves_vectorized(nodes: list[tuple[int, bytes, list[int]]]) -> list[int]:
+    # the boards as an (N, 64) array, and the node each move is made from
+    boards = numpy.frombuffer(
+        b"".join(squares for score, squares, codes in nodes), dtype=numpy.int8
+    ).reshape(-1, 64)
+    counts = [len(codes) for score, squares, codes in nodes]
+    node = numpy.repeat(numpy.arange(len(nodes)), counts)
+    parents = numpy.repeat([score for score, squares, codes in nodes], counts)
+    codes = numpy.fromiter(
+        (code for score, squares, codes in nodes for code in codes),
+        dtype=numpy.int64,
+        count=sum(counts),
+    )
+
+    old_squares = codes & 63
+    new_squares = codes >> 6 & 63
+    flags = codes & FLAG_MASK
+    pieces = boards[node, old_squares]
+
+    # en passant captures beside the square the pawn lands on
+    captured_squares = numpy.where(
+        flags == EN_PASSANT, old_squares & 56 | new_squares & 7, new_squares
+    )
+    captured = boards[node, captured_squares]
+
+    # the promoted piece is numbered like the pawn's colour
+    promoted = 2 + (codes >> 12 & 3) + numpy.where(pieces > 6, 6, 0)
+    placed = numpy.where(codes & PROMOTION != 0, promoted, pieces)
+
+    # castling moves the rook as well, other moves use the empty code so add nothing
+    king_side, queen_side = flags == KING_CASTLE, flags == QUEEN_CASTLE
+    rook_old = old_squares + numpy.where(king_side, 3, numpy.where(queen_side, -4, 0))
+    rook_new = old_squares + numpy.where(king_side, 1, numpy.where(queen_side, -1, 0))
+    rooks = numpy.where(king_side | queen_side, boards[node, rook_old], 0)
+
+    # look up every change of every move at once
+    scores = (
+        parents
+        - SCORE_TABLE[pieces, old_squares]
+        - SCORE_TABLE[captured, captured_squares]
+        + SCORE_TABLE[placed, new_squares]
+        + SCORE_TABLE[rooks, rook_new]
+        - SCORE_TABLE[rooks, rook_old]
+    )
+    return scores.tolist()
+
+
+def score_moves(
+    nodes: list[tuple[int, bytes, list[int]]], vectorized: bool = True
+) -> list[int]:
+    # the score after each move of each node, the same as making it and evaluating
+    if vectorized and numpy is not None:
+        return score_moves_vectorized(nodes)
+
+    return score_moves_scalar(nodes)
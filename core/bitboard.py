@@ -0,0 +1,783 @@
+from __future__ import annotations
+from core.move import (
+    Move,
+    encode,
+    QUIET,
+    KING_CASTLE,
+    QUEEN_CASTLE,
+    CAPTURE,
+    EN_PASSANT,
+    PROMOTION,
+    PROMOTION_FLAGS,
+    PROMOTION_PIECES,
+    FLAG_MASK,
+)
+from core.zobrist import PIECE_KEYS, SIDE_KEY, CASTLE_KEYS, EN_PASSANT_KEYS
+from core.fen import load_fen, dump_fen
+from core.piecetables import MATERIAL, POSITION
+from core.constants import K_OFFSETS, C_OFFSETS, D_OFFSETS
+
+# squares are numbered rank * 8 + file, so a8 is 0 and h1 is 63
+ALL_SQUARES = (1 << 64) - 1
+
+
+def offset_targets(square: int, offsets: list[tuple[int, int]]) -> int:
+    rank, file = divmod(square, 8)
+    targets = 0
+
+    # add every offset that stays on the board
+    for rank_offset, file_offset in offsets:
+        new_rank, new_file = rank + rank_offset, file + file_offset
+        if 0 <= new_rank <= 7 and 0 <= new_file <= 7:
+            targets |= 1 << (new_rank * 8 + new_file)
+
+    return targets
+
+
+def ray_targets(square: int, offset: tuple[int, int]) -> int:
+    rank, file = divmod(square, 8)
+    targets = 0
+
+    # slide in the direction until the edge of the board
+    new_rank, new_file = rank + offset[0], file + offset[1]
+    while 0 <= new_rank <= 7 and 0 <= new_file <= 7:
+        targets |= 1 << (new_rank * 8 + new_file)
+        new_rank, new_file = new_rank + offset[0], new_file + offset[1]
+
+    return targets
+
+
+# precomputed attacks for pieces that don't slide
+KNIGHT_ATTACKS = [offset_targets(square, K_OFFSETS) for square in range(64)]
+KING_ATTACKS = [offset_targets(square, C_OFFSETS + D_OFFSETS) for square in range(64)]
+WHITE_PAWN_ATTACKS = [
+    offset_targets(square, [(-1, -1), (-1, 1)]) for square in range(64)
+]
+BLACK_PAWN_ATTACKS = [offset_targets(square, [(1, -1), (1, 1)]) for square in range(64)]
+
+# rays in each direction, split by whether the square number increases along them
+POSITIVE_RAYS = [
+    [ray_targets(square, offset) for square in range(64)]
+    for offset in [(0, 1), (1, 0), (1, 1), (1, -1)]
+]
+NEGATIVE_RAYS = [
+    [ray_targets(square, offset) for square in range(64)]
+    for offset in [(0, -1), (-1, 0), (-1, -1), (-1, 1)]
+]
+
+# the rook, and the squares it moves between, for each type of castling
+CASTLING_ROOKS = {
+    "K": ("R", 63, 61),
+    "Q": ("R", 56, 59),
+    "k": ("r", 7, 5),
+    "q": ("r", 0, 3),
+}
+
+# the indexes of cardinal and diagonal rays in each list
+CARDINAL_RAYS = (0, 1)
+DIAGONAL_RAYS = (2, 3)
+
+
+def slide_targets(square: int, occupied: int, rays: tuple[int, int]) -> int:
+    targets = 0
+
+    for index in rays:
+        # stop at the first blocker, which is the lowest square
+        ray = POSITIVE_RAYS[index][square]
+        blockers = ray & occupied
+        if blockers:
+            first = (blockers & -blockers).bit_length() - 1
+            ray ^= POSITIVE_RAYS[index][first]
+        targets |= ray
+
+        # stop at the first blocker, which is the highest square
+        ray = NEGATIVE_RAYS[index][square]
+        blockers = ray & occupied
+        if blockers:
+            first = blockers.bit_length() - 1
+            ray ^= NEGATIVE_RAYS[index][first]
+        targets |= ray
+
+    return targets
+
+
+class BitBoard:
+    def __init__(self, board: list[list[str]], starter_options: bool) -> None:
+        # a bitboard for each piece, and the piece on each square for quick lookups
+        self.pieces = {piece: 0 for piece in "PNBRQKpnbrqk"}
+        self.squares = [piece for rank in board for piece in rank]
+
+        for square, piece in enumerate(self.squares):
+            if piece:
+                self.pieces[piece] |= 1 << square
+
+        self.update_occupancy()
+
+        if starter_options:
+            # set additional options
+            self.white_to_move = True
+            self.last_move = None
+            self.w_castle_k = True
+            self.w_castle_q = True
+            self.b_castle_k = True
+            self.b_castle_q = True
+            self.en_passant = None
+            self.halfmove_clock = 0
+            self.fullmove_number = 1
+
+            self.white_king = divmod(self.pieces["K"].bit_length() - 1, 8)
+            self.black_king = divmod(self.pieces["k"].bit_length() - 1, 8)
+
+            self.hash = self.compute_hash()
+            self.material, self.position = self.compute_score()
+
+            # the information needed to undo each move made
+            self.history = []
+
+    @classmethod
+    def from_fen(cls, fen: str) -> BitBoard:
+        return load_fen(cls, fen)
+
+    def to_fen(self) -> str:
+        return dump_fen(self)
+
+    @property
+    def board(self) -> list[list[str]]:
+        # build the 8x8 list used by the list backend
+        return [self.squares[i : i + 8] for i in range(0, 64, 8)]
+
+    def piece_at(self, rank: int, file: int) -> str:
+        return self.squares[rank * 8 + file]
+
+    def update_occupancy(self) -> None:
+        pieces = self.pieces
+        self.white_pieces = (
+            pieces["P"]
+            | pieces["N"]
+            | pieces["B"]
+            | pieces["R"]
+            | pieces["Q"]
+            | pieces["K"]
+        )
+        self.black_pieces = (
+            pieces["p"]
+            | pieces["n"]
+            | pieces["b"]
+            | pieces["r"]
+            | pieces["q"]
+            | pieces["k"]
+        )
+        self.occupied = self.white_pieces | self.black_pieces
+
+    def compute_hash(self) -> int:
+        hash = 0
+
+        # add every piece on the board
+        for square, piece in enumerate(self.squares):
+            if piece:
+                rank, file = divmod(square, 8)
+                hash ^= PIECE_KEYS[piece][rank][file]
+
+        # add the side to move, castle rights and en passant square
+        if not self.white_to_move:
+            hash ^= SIDE_KEY
+        hash ^= self.castle_hash()
+        hash ^= self.en_passant_hash()
+
+        return hash
+
+    def castle_hash(self) -> int:
+        hash = 0
+
+        if self.w_castle_k:
+            hash ^= CASTLE_KEYS["K"]
+        if self.w_castle_q:
+            hash ^= CASTLE_KEYS["Q"]
+        if self.b_castle_k:
+            hash ^= CASTLE_KEYS["k"]
+        if self.b_castle_q:
+            hash ^= CASTLE_KEYS["q"]
+
+        return hash
+
+    def en_passant_hash(self) -> int:
+        if self.en_passant is None:
+            return 0
+
+        # only add the square if a pawn can capture on it
+        rank, file = self.en_passant
+        square = rank * 8 + file
+        if self.white_to_move:
+            capturers = BLACK_PAWN_ATTACKS[square] & self.pieces["P"]
+        else:
+            capturers = WHITE_PAWN_ATTACKS[square] & self.pieces["p"]
+
+        return EN_PASSANT_KEYS[file] if capturers else 0
+
+    def compute_score(self) -> tuple[int, int]:
+        material = 0
+        position = 0
+
+        # add the value of every piece on the board
+        for square, piece in enumerate(self.squares):
+            if piece:
+                rank, file = divmod(square, 8)
+                material += MATERIAL[piece]
+                position += POSITION[piece][rank][file]
+
+        return material, position
+
+    def square_attacked(
+        self, square: int, by_white: bool, occupied: int | None = None
+    ) -> bool:
+        pieces = self.pieces
+        if occupied is None:
+            occupied = self.occupied
+
+        # look outwards from the square using each piece's attacks
+        if by_white:
+            if BLACK_PAWN_ATTACKS[square] & pieces["P"]:
+                return True
+            if KNIGHT_ATTACKS[square] & pieces["N"]:
+                return True
+            if KING_ATTACKS[square] & pieces["K"]:
+                return True
+            cardinal, diagonal = pieces["R"] | pieces["Q"], pieces["B"] | pieces["Q"]
+        else:
+            if WHITE_PAWN_ATTACKS[square] & pieces["p"]:
+                return True
+            if KNIGHT_ATTACKS[square] & pieces["n"]:
+                return True
+            if KING_ATTACKS[square] & pieces["k"]:
+                return True
+            cardinal, diagonal = pieces["r"] | pieces["q"], pieces["b"] | pieces["q"]
+
+        if cardinal and slide_targets(square, occupied, CARDINAL_RAYS) & cardinal:
+            return True
+        if diagonal and slide_targets(square, occupied, DIAGONAL_RAYS) & diagonal:
+            return True
+
+        return False
+
+    def is_square_attacked(self, square: tuple[int, int], by_white: bool) -> bool:
+        return self.square_attacked(square[0] * 8 + square[1], by_white)
+
+    def can_attack_king(self) -> bool:
+        king = self.pieces["k" if self.white_to_move else "K"]
+        return self.square_attacked(king.bit_length() - 1, self.white_to_move)
+
+    def in_check(self) -> bool:
+        king = self.pieces["K" if self.white_to_move else "k"]
+        return self.square_attacked(king.bit_length() - 1, not self.white_to_move)
+
+    def is_repetition(self, count: int = 1) -> bool:
+        # positions can only repeat since the last capture or pawn move
+        history = self.history
+        start = max(len(history) - self.halfmove_clock, 0)
+        repeats = 0
+
+        # check the positions with the same side to move, the hash before each move
+        for index in range(len(history) - 2, start - 1, -2):
+            if history[index][8] == self.hash:
+                repeats += 1
+                if repeats >= count:
+                    return True
+
+        return False
+
+    def get_checks_and_pins(self) -> tuple[int, int, dict[int, int]]:
+        pieces = self.pieces
+
+        if self.white_to_move:
+            square = pieces["K"].bit_length() - 1
+            own = self.white_pieces
+            pawns = WHITE_PAWN_ATTACKS[square] & pieces["p"]
+            knights = KNIGHT_ATTACKS[square] & pieces["n"]
+            cardinal, diagonal = pieces["r"] | pieces["q"], pieces["b"] | pieces["q"]
+        else:
+            square = pieces["k"].bit_length() - 1
+            own = self.black_pieces
+            pawns = BLACK_PAWN_ATTACKS[square] & pieces["P"]
+            knights = KNIGHT_ATTACKS[square] & pieces["N"]
+            cardinal, diagonal = pieces["R"] | pieces["Q"], pieces["B"] | pieces["Q"]
+
+        # the number of checks, squares that stop a check, and where pinned pieces go
+        checkers = (pawns | knights).bit_count()
+        blocks = pawns | knights
+        pins = {}
+
+        # look along each line for a sliding piece giving check or pinning a piece
+        for index in CARDINAL_RAYS + DIAGONAL_RAYS:
+            sliders = cardinal if index in CARDINAL_RAYS else diagonal
+
+            for rays, positive in (
+                (POSITIVE_RAYS[index], True),
+                (NEGATIVE_RAYS[index], False),
+            ):
+                ray = rays[square]
+                if not ray & sliders:
+                    continue
+
+                # find the first piece along the ray
+                blockers = ray & self.occupied
+                first = (
+                    blockers & -blockers if positive else 1 << blockers.bit_length() - 1
+                )
+
+                if first & sliders:
+                    checkers += 1
+                    blocks |= ray ^ rays[first.bit_length() - 1]
+
+                elif first & own:
+                    # find the second piece along the ray
+                    blockers ^= first
+                    if not blockers:
+                        continue
+                    second = (
+                        blockers & -blockers
+                        if positive
+                        else 1 << blockers.bit_length() - 1
+                    )
+
+                    if second & sliders:
+                        pins[first.bit_length() - 1] = (
+                            ray ^ rays[second.bit_length() - 1]
+                        )
+
+        return checkers, blocks, pins
+
+    def get_legal_moves(self, captures_only: bool = False) -> list[Move]:
+        moves = []
+        king = self.pieces["K" if self.white_to_move else "k"]
+        king_square = king.bit_length() - 1
+        checkers, blocks, pins = self.get_checks_and_pins()
+
+        pseudo_moves = self.get_moves()
+
+        # only keep captures and promotions, such as for a quiescence search
+        if captures_only:
+            pseudo_moves = [
+                move for move in pseudo_moves if move.code & (CAPTURE | PROMOTION)
+            ]
+
+        # remove the king so it can't block attacks on the squares it moves to
+        occupied = self.occupied ^ king
+
+        for move in pseudo_moves:
+            code = move.code
+            old_square = code & 63
+            new_square = code >> 6 & 63
+
+            if old_square == king_square:
+                # the king can't move to an attacked square
+                if self.square_attacked(new_square, not self.white_to_move, occupied):
+                    continue
+
+                flags = code & FLAG_MASK
+                if flags == KING_CASTLE or flags == QUEEN_CASTLE:
+                    # skip move since you can't castle in check
+                    if checkers:
+                        continue
+
+                    # skip move since you can't move through a check in castling
+                    passing = (old_square + new_square) // 2
+                    if self.square_attacked(passing, not self.white_to_move):
+                        continue
+
+            else:
+                # only the king can move out of a double check
+                if checkers > 1:
+                    continue
+
+                # the move has to capture the checking piece or block the check
+                if checkers and not blocks >> new_square & 1:
+                    # en passant captures a checking pawn beside the square it lands on
+                    if code & FLAG_MASK != EN_PASSANT:
+                        continue
+                    if not blocks >> (old_square & 56 | new_square & 7) & 1:
+                        continue
+
+                # pinned pieces can only move along the pin
+                if old_square in pins and not pins[old_square] >> new_square & 1:
+                    continue
+
+            # check en passant by making the move, since it removes two pieces
+            if code & FLAG_MASK == EN_PASSANT:
+                self.push(move)
+                illegal = self.square_attacked(king_square, self.white_to_move)
+                self.pop()
+
+                if illegal:
+                    continue
+
+            moves.append(move)
+
+        return moves
+
+    def copy(self) -> BitBoard:
+        board = BitBoard.__new__(BitBoard)
+        board.pieces = self.pieces.copy()
+        board.squares = self.squares.copy()
+        board.white_pieces = self.white_pieces
+        board.black_pieces = self.black_pieces
+        board.occupied = self.occupied
+
+        board.white_to_move = self.white_to_move
+        board.last_move = self.last_move
+        board.w_castle_k = self.w_castle_k
+        board.w_castle_q = self.w_castle_q
+        board.b_castle_k = self.b_castle_k
+        board.b_castle_q = self.b_castle_q
+        board.en_passant = self.en_passant
+        board.halfmove_clock = self.halfmove_clock
+        board.fullmove_number = self.fullmove_number
+        board.white_king = self.white_king
+        board.black_king = self.black_king
+        board.hash = self.hash
+        board.material = self.material
+        board.position = self.position
+        board.history = self.history.copy()
+
+        return board
+
+    def make_move(self, move: Move) -> BitBoard:
+        # make the move on a copy so this board stays the same
+        board = self.copy()
+        board.push(move)
+
+        return board
+
+    def push(self, move: Move) -> None:
+        pieces, squares = self.pieces, self.squares
+        code = move.code
+        flags = code & FLAG_MASK
+        old_square = code & 63
+        new_square = code >> 6 & 63
+        old_rank, old_file = old_square >> 3, old_square & 7
+        new_rank, new_file = new_square >> 3, new_square & 7
+        piece = squares[old_square]
+
+        # en passant captures the pawn beside the moving pawn
+        captured_square = new_square
+        if flags == EN_PASSANT:
+            captured_square = old_rank * 8 + new_file
+        captured = squares[captured_square]
+
+        # save everything needed to undo the move
+        self.history.append(
+            (
+                move,
+                piece,
+                captured,
+                (self.w_castle_k, self.w_castle_q, self.b_castle_k, self.b_castle_q),
+                self.en_passant,
+                self.white_king,
+                self.black_king,
+                self.last_move,
+                self.hash,
+                self.material,
+                self.position,
+                self.halfmove_clock,
+                self.white_pieces,
+                self.black_pieces,
+            )
+        )
+
+        # the clock for the fifty move rule restarts on captures and pawn moves
+        if captured or piece in ("P", "p"):
+            self.halfmove_clock = 0
+        else:
+            self.halfmove_clock += 1
+
+        # remove the moving piece and any captured piece
+        hash = self.hash ^ SIDE_KEY ^ self.castle_hash() ^ self.en_passant_hash()
+        pieces[piece] ^= 1 << old_square
+        hash ^= PIECE_KEYS[piece][old_rank][old_file]
+        captured_rank, captured_file = divmod(captured_square, 8)
+        if captured:
+            pieces[captured] ^= 1 << captured_square
+            hash ^= PIECE_KEYS[captured][captured_rank][captured_file]
+
+        # remove the moving piece and any captured piece from the score
+        material, position = self.material, self.position
+        position -= POSITION[piece][old_rank][old_file]
+        if captured:
+            material -= MATERIAL[captured]
+            position -= POSITION[captured][captured_rank][captured_file]
+
+        # check if promotion
+        if code & PROMOTION:
+            promoted = PROMOTION_PIECES[code >> 12 & 3]
+            if not self.white_to_move:
+                promoted = promoted.lower()
+            material += MATERIAL[promoted] - MATERIAL[piece]
+            piece = promoted
+
+        # move the piece
+        pieces[piece] |= 1 << new_square
+        squares[captured_square] = ""
+        squares[new_square] = piece
+        squares[old_square] = ""
+        hash ^= PIECE_KEYS[piece][new_rank][new_file]
+        position += POSITION[piece][new_rank][new_file]
+        moved = (1 << old_square) | (1 << new_square)
+
+        if flags == KING_CASTLE or flags == QUEEN_CASTLE:
+            # get the rook and the squares it moves between
+            rook, old_rook, new_rook = CASTLING_ROOKS[move.castling_type]
+
+            pieces[rook] ^= (1 << old_rook) | (1 << new_rook)
+            squares[new_rook] = rook
+            squares[old_rook] = ""
+            hash ^= PIECE_KEYS[rook][old_rook // 8][old_rook % 8]
+            hash ^= PIECE_KEYS[rook][new_rook // 8][new_rook % 8]
+            position -= POSITION[rook][old_rook // 8][old_rook % 8]
+            position += POSITION[rook][new_rook // 8][new_rook % 8]
+            moved |= (1 << old_rook) | (1 << new_rook)
+
+        # update the occupancy of each colour
+        removed = ~(moved | 1 << captured_square)
+        if self.white_to_move:
+            self.white_pieces ^= moved
+            self.black_pieces &= removed
+        else:
+            self.black_pieces ^= moved
+            self.white_pieces &= removed
+        self.occupied = self.white_pieces | self.black_pieces
+
+        # update additional information
+        self.last_move = move
+        self.white_to_move = not self.white_to_move
+
+        # the move number goes up after black moves
+        if self.white_to_move:
+            self.fullmove_number += 1
+
+        # a pawn moving two squares can be captured en passant
+        self.en_passant = None
+        if piece in ("P", "p") and abs(new_square - old_square) == 16:
+            self.en_passant = ((old_rank + new_rank) // 2, old_file)
+
+        # update king location and castle rights if king moved
+        if piece == "K":
+            self.white_king = (new_rank, new_file)
+            self.w_castle_k = False
+            self.w_castle_q = False
+        elif piece == "k":
+            self.black_king = (new_rank, new_file)
+            self.b_castle_k = False
+            self.b_castle_q = False
+
+        # update castle rights if rooks moved
+        elif piece == "R":
+            if old_square == 63:
+                self.w_castle_k = False
+            elif old_square == 56:
+                self.w_castle_q = False
+
+        elif piece == "r":
+            if old_square == 7:
+                self.b_castle_k = False
+            elif old_square == 0:
+                self.b_castle_q = False
+
+        # update castle rights if rooks were captured
+        if captured == "R":
+            if new_square == 63:
+                self.w_castle_k = False
+            elif new_square == 56:
+                self.w_castle_q = False
+
+        elif captured == "r":
+            if new_square == 7:
+                self.b_castle_k = False
+            elif new_square == 0:
+                self.b_castle_q = False
+
+        # add the new castle rights and en passant square to the hash
+        self.hash = hash ^ self.castle_hash() ^ self.en_passant_hash()
+        self.material, self.position = material, position
+
+    def pop(self) -> Move:
+        (
+            move,
+            piece,
+            captured,
+            castle_rights,
+            self.en_passant,
+            self.white_king,
+            self.black_king,
+            self.last_move,
+            self.hash,
+            self.material,
+            self.position,
+            self.halfmove_clock,
+            self.white_pieces,
+            self.black_pieces,
+        ) = self.history.pop()
+
+        pieces, squares = self.pieces, self.squares
+        code = move.code
+        old_square = code & 63
+        new_square = code >> 6 & 63
+
+        # remove the piece that moved, which may have been promoted
+        pieces[squares[new_square]] ^= 1 << new_square
+
+        # put back the moving piece and any captured piece
+        pieces[piece] |= 1 << old_square
+        squares[old_square] = piece
+        squares[new_square] = ""
+
+        flags = code & FLAG_MASK
+        captured_square = new_square
+        if flags == EN_PASSANT:
+            captured_square = (old_square & 56) | (new_square & 7)
+        squares[captured_square] = captured
+        if captured:
+            pieces[captured] |= 1 << captured_square
+
+        # put back the rook if castling
+        if flags == KING_CASTLE or flags == QUEEN_CASTLE:
+            rook, old_rook, new_rook = CASTLING_ROOKS[move.castling_type]
+            pieces[rook] ^= (1 << old_rook) | (1 << new_rook)
+            squares[old_rook] = rook
+            squares[new_rook] = ""
+
+        self.occupied = self.white_pieces | self.black_pieces
+        self.w_castle_k, self.w_castle_q, self.b_castle_k, self.b_castle_q = (
+            castle_rights
+        )
+        self.white_to_move = not self.white_to_move
+        if not self.white_to_move:
+            self.fullmove_number -= 1
+
+        return move
+
+    def add_moves(self, moves: list[Move], square: int, targets: int) -> None:
+        squares = self.squares
+
+        # add a move to each set bit
+        while targets:
+            bit = targets & -targets
+            targets ^= bit
+            new_square = bit.bit_length() - 1
+            captured = squares[new_square]
+            code = encode(square, new_square, CAPTURE if captured else QUIET)
+            moves.append(Move(code, captured))
+
+    def get_moves(self) -> list[Move]:
+        moves = []
+        pieces = self.pieces
+        empty = ~self.occupied & ALL_SQUARES
+
+        if self.white_to_move:
+            own, enemy = self.white_pieces, self.black_pieces
+            pawn, knight, bishop, rook, queen, king = "PNBRQK"
+            pawn_attacks, push, first_rank = WHITE_PAWN_ATTACKS, -8, 6
+        else:
+            own, enemy = self.black_pieces, self.white_pieces
+            pawn, knight, bishop, rook, queen, king = "pnbrqk"
+            pawn_attacks, push, first_rank = BLACK_PAWN_ATTACKS, 8, 1
+
+        not_own = ~own & ALL_SQUARES
+
+        en_passant = 0
+        if self.en_passant is not None:
+            en_passant = 1 << (self.en_passant[0] * 8 + self.en_passant[1])
+
+        # pawns
+        bitboard = pieces[pawn]
+        while bitboard:
+            bit = bitboard & -bitboard
+            bitboard ^= bit
+            square = bit.bit_length() - 1
+
+            targets = pawn_attacks[square] & enemy
+
+            # move one square up, and two squares if on the first rank
+            one_square = square + push
+            if empty >> one_square & 1:
+                targets |= 1 << one_square
+                two_square = one_square + push
+                if square // 8 == first_rank and empty >> two_square & 1:
+                    targets |= 1 << two_square
+
+            # add each move, and each promotion if moving to the last rank
+            while targets:
+                bit = targets & -targets
+                targets ^= bit
+                new_square = bit.bit_length() - 1
+                captured = self.squares[new_square]
+                code = encode(square, new_square, CAPTURE if captured else QUIET)
+
+                if new_square < 8 or new_square >= 56:
+                    for promotion in "QRBN":
+                        moves.append(Move(code | PROMOTION_FLAGS[promotion], captured))
+                else:
+                    moves.append(Move(code, captured))
+
+            # capture en passant
+            if en_passant and pawn_attacks[square] & en_passant:
+                new_square = en_passant.bit_length() - 1
+                captured = self.squares[(square & 56) | (new_square & 7)]
+                moves.append(Move(encode(square, new_square, EN_PASSANT), captured))
+
+        # knights
+        bitboard = pieces[knight]
+        while bitboard:
+            bit = bitboard & -bitboard
+            bitboard ^= bit
+            square = bit.bit_length() - 1
+            self.add_moves(moves, square, KNIGHT_ATTACKS[square] & not_own)
+
+        # bishops, rooks and queens
+        for piece, rays in (
+            (bishop, DIAGONAL_RAYS),
+            (rook, CARDINAL_RAYS),
+            (queen, CARDINAL_RAYS + DIAGONAL_RAYS),
+        ):
+            bitboard = pieces[piece]
+            while bitboard:
+                bit = bitboard & -bitboard
+                bitboard ^= bit
+                square = bit.bit_length() - 1
+                targets = slide_targets(square, self.occupied, rays) & not_own
+                self.add_moves(moves, square, targets)
+
+        # king
+        square = pieces[king].bit_length() - 1
+        if square >= 0:
+            self.add_moves(moves, square, KING_ATTACKS[square] & not_own)
+
+        # castling
+        squares = self.squares
+        if self.white_to_move and square == 60:
+            if self.w_castle_k:
+                if not squares[61] and not squares[62] and squares[63] == "R":
+                    moves.append(Move(encode(60, 62, KING_CASTLE)))
+
+            if self.w_castle_q:
+                if (
+                    not squares[59]
+                    and not squares[58]
+                    and not squares[57]
+                    and squares[56] == "R"
+                ):
+                    moves.append(Move(encode(60, 58, QUEEN_CASTLE)))
+
+        elif not self.white_to_move and square == 4:
+            if self.b_castle_k:
+                if not squares[5] and not squares[6] and squares[7] == "r":
+                    moves.append(Move(encode(4, 6, KING_CASTLE)))
+
+            if self.b_castle_q:
+                if (
+                    not squares[3]
+                    and not squares[2]
+                    and not squares[1]
+                    and squares[0] == "r"
+                ):
+                    moves.append(Move(encode(4, 2, QUEEN_CASTLE)))
+
+        return moves
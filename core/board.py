@@ -0,0 +1,714 @@
+from __future__ import annotations
+from core.move import (
+    Move,
+    encode,
+    QUIET,
+    KING_CASTLE,
+    QUEEN_CASTLE,
+    CAPTURE,
+    EN_PASSANT,
+    PROMOTION,
+    PROMOTION_FLAGS,
+    PROMOTION_PIECES,
+    FLAG_MASK,
+)
+from core.zobrist import PIECE_KEYS, SIDE_KEY, CASTLE_KEYS, EN_PASSANT_KEYS
+from core.fen import load_fen, dump_fen
+from core.piecetables import MATERIAL, POSITION
+from core.constants import K_OFFSETS, C_OFFSETS, D_OFFSETS
+
+
+class Board:
+    def __init__(self, board: list[list[str]], starter_options: bool) -> None:
+        self.board = board
+
+        if starter_options:
+            # set additional options
+            self.white_to_move = True
+            self.last_move = None
+            self.w_castle_k = True
+            self.w_castle_q = True
+            self.b_castle_k = True
+            self.b_castle_q = True
+            self.en_passant = None
+            self.halfmove_clock = 0
+            self.fullmove_number = 1
+
+            for rank in range(8):
+                for file in range(8):
+                    piece = self.board[rank][file]
+
+                    if piece == "K":
+                        self.white_king = (rank, file)
+                    elif piece == "k":
+                        self.black_king = (rank, file)
+
+            self.hash = self.compute_hash()
+            self.material, self.position = self.compute_score()
+
+            # the information needed to undo each move made
+            self.history = []
+
+    @classmethod
+    def from_fen(cls, fen: str) -> Board:
+        return load_fen(cls, fen)
+
+    def to_fen(self) -> str:
+        return dump_fen(self)
+
+    def compute_hash(self) -> int:
+        hash = 0
+
+        # add every piece on the board
+        for rank in range(8):
+            for file in range(8):
+                piece = self.board[rank][file]
+                if piece:
+                    hash ^= PIECE_KEYS[piece][rank][file]
+
+        # add the side to move, castle rights and en passant square
+        if not self.white_to_move:
+            hash ^= SIDE_KEY
+        hash ^= self.castle_hash()
+        hash ^= self.en_passant_hash()
+
+        return hash
+
+    def castle_hash(self) -> int:
+        hash = 0
+
+        if self.w_castle_k:
+            hash ^= CASTLE_KEYS["K"]
+        if self.w_castle_q:
+            hash ^= CASTLE_KEYS["Q"]
+        if self.b_castle_k:
+            hash ^= CASTLE_KEYS["k"]
+        if self.b_castle_q:
+            hash ^= CASTLE_KEYS["q"]
+
+        return hash
+
+    def piece_at(self, rank: int, file: int) -> str:
+        return self.board[rank][file]
+
+    def en_passant_hash(self) -> int:
+        if self.en_passant is None:
+            return 0
+
+        # only add the square if a pawn can capture on it
+        rank, file = self.en_passant
+        if self.white_to_move:
+            pawn, pawn_rank = "P", rank + 1
+        else:
+            pawn, pawn_rank = "p", rank - 1
+
+        if file > 0 and self.board[pawn_rank][file - 1] == pawn:
+            return EN_PASSANT_KEYS[file]
+        if file < 7 and self.board[pawn_rank][file + 1] == pawn:
+            return EN_PASSANT_KEYS[file]
+
+        return 0
+
+    def compute_score(self) -> tuple[int, int]:
+        material = 0
+        position = 0
+
+        # add the value of every piece on the board
+        for rank in range(8):
+            for file in range(8):
+                piece = self.board[rank][file]
+                if piece:
+                    material += MATERIAL[piece]
+                    position += POSITION[piece][rank][file]
+
+        return material, position
+
+    def is_square_attacked(self, square: tuple[int, int], by_white: bool) -> bool:
+        board = self.board
+        rank, file = square
+
+        if by_white:
+            pawn, knight, bishop, rook, queen, king = "PNBRQK"
+            pawn_rank = rank + 1
+        else:
+            pawn, knight, bishop, rook, queen, king = "pnbrqk"
+            pawn_rank = rank - 1
+
+        # look for a pawn attacking diagonally
+        if 0 <= pawn_rank <= 7:
+            if file > 0 and board[pawn_rank][file - 1] == pawn:
+                return True
+            if file < 7 and board[pawn_rank][file + 1] == pawn:
+                return True
+
+        # look for a knight
+        for rank_offset, file_offset in K_OFFSETS:
+            new_rank, new_file = rank + rank_offset, file + file_offset
+            if 0 <= new_rank <= 7 and 0 <= new_file <= 7:
+                if board[new_rank][new_file] == knight:
+                    return True
+
+        # look along each line for a king next to the square or a sliding piece
+        for offsets, slider in ((C_OFFSETS, rook), (D_OFFSETS, bishop)):
+            for rank_offset, file_offset in offsets:
+                new_rank, new_file = rank + rank_offset, file + file_offset
+                distance = 1
+
+                while 0 <= new_rank <= 7 and 0 <= new_file <= 7:
+                    piece = board[new_rank][new_file]
+
+                    if piece:
+                        if piece == slider or piece == queen:
+                            return True
+                        if piece == king and distance == 1:
+                            return True
+                        break
+
+                    new_rank, new_file = new_rank + rank_offset, new_file + file_offset
+                    distance += 1
+
+        return False
+
+    def can_attack_king(self) -> bool:
+        king_pos = self.black_king if self.white_to_move else self.white_king
+        return self.is_square_attacked(king_pos, self.white_to_move)
+
+    def in_check(self) -> bool:
+        king_pos = self.white_king if self.white_to_move else self.black_king
+        return self.is_square_attacked(king_pos, not self.white_to_move)
+
+    def is_repetition(self, count: int = 1) -> bool:
+        # positions can only repeat since the last capture or pawn move
+        history = self.history
+        start = max(len(history) - self.halfmove_clock, 0)
+        repeats = 0
+
+        # check the positions with the same side to move, the hash before each move
+        for index in range(len(history) - 2, start - 1, -2):
+            if history[index][8] == self.hash:
+                repeats += 1
+                if repeats >= count:
+                    return True
+
+        return False
+
+    def get_checks_and_pins(
+        self,
+    ) -> tuple[int, set[int], dict[int, set[int]]]:
+        board = self.board
+        rank, file = self.white_king if self.white_to_move else self.black_king
+
+        if self.white_to_move:
+            pawn, knight, bishop, rook, queen = "pnbrq"
+            pawn_rank = rank - 1
+        else:
+            pawn, knight, bishop, rook, queen = "PNBRQ"
+            pawn_rank = rank + 1
+
+        # the number of checks, squares that stop a check, and where pinned pieces go
+        # squares are numbered rank * 8 + file like in moves
+        checkers = 0
+        blocks = set()
+        pins = {}
+
+        # look for a pawn giving check
+        if 0 <= pawn_rank <= 7:
+            for new_file in (file - 1, file + 1):
+                if 0 <= new_file <= 7 and board[pawn_rank][new_file] == pawn:
+                    checkers += 1
+                    blocks.add(pawn_rank * 8 + new_file)
+
+        # look for a knight giving check
+        for rank_offset, file_offset in K_OFFSETS:
+            new_rank, new_file = rank + rank_offset, file + file_offset
+            if 0 <= new_rank <= 7 and 0 <= new_file <= 7:
+                if board[new_rank][new_file] == knight:
+                    checkers += 1
+                    blocks.add(new_rank * 8 + new_file)
+
+        # look along each line for a sliding piece giving check or pinning a piece
+        for offsets, slider in ((C_OFFSETS, rook), (D_OFFSETS, bishop)):
+            for rank_offset, file_offset in offsets:
+                new_rank, new_file = rank + rank_offset, file + file_offset
+                line = []
+                pinned = None
+
+                while 0 <= new_rank <= 7 and 0 <= new_file <= 7:
+                    piece = board[new_rank][new_file]
+                    line.append(new_rank * 8 + new_file)
+
+                    if piece:
+                        # the piece belongs to the player to move
+                        if piece.isupper() == self.white_to_move:
+                            if pinned is not None:
+                                break
+                            pinned = new_rank * 8 + new_file
+
+                        # the piece is an opponent's piece attacking along the line
+                        elif piece == slider or piece == queen:
+                            if pinned is None:
+                                checkers += 1
+                                blocks.update(line)
+                            else:
+                                pins[pinned] = set(line)
+                            break
+
+                        else:
+                            break
+
+                    new_rank, new_file = new_rank + rank_offset, new_file + file_offset
+
+        return checkers, blocks, pins
+
+    def get_legal_moves(self, captures_only: bool = False) -> list[Move]:
+        moves = []
+        king_pos = self.white_king if self.white_to_move else self.black_king
+        checkers, blocks, pins = self.get_checks_and_pins()
+        pseudo_moves = self.get_moves()
+
+        # only keep captures and promotions, such as for a quiescence search
+        if captures_only:
+            pseudo_moves = [
+                move for move in pseudo_moves if move.code & (CAPTURE | PROMOTION)
+            ]
+
+        # remove the king so it can't block attacks on the squares it moves to
+        king = self.board[king_pos[0]][king_pos[1]]
+        self.board[king_pos[0]][king_pos[1]] = ""
+        king_square = king_pos[0] * 8 + king_pos[1]
+
+        for move in pseudo_moves:
+            code = move.code
+            old_square = code & 63
+            new_square = code >> 6 & 63
+
+            if old_square == king_square:
+                # the king can't move to an attacked square
+                if self.is_square_attacked(
+                    divmod(new_square, 8), not self.white_to_move
+                ):
+                    continue
+
+                flags = code & FLAG_MASK
+                if flags == KING_CASTLE or flags == QUEEN_CASTLE:
+                    # skip move since you can't castle in check
+                    if checkers:
+                        continue
+
+                    # skip move since you can't move through a check in castling
+                    passing = divmod((old_square + new_square) // 2, 8)
+                    if self.is_square_attacked(passing, not self.white_to_move):
+                        continue
+
+            else:
+                # only the king can move out of a double check
+                if checkers > 1:
+                    continue
+
+                # the move has to capture the checking piece or block the check
+                if checkers and new_square not in blocks:
+                    # en passant captures a checking pawn beside the square it lands on
+                    if code & FLAG_MASK != EN_PASSANT:
+                        continue
+                    if (old_square & 56 | new_square & 7) not in blocks:
+                        continue
+
+                # pinned pieces can only move along the pin
+                if old_square in pins and new_square not in pins[old_square]:
+                    continue
+
+            # check en passant by making the move, since it removes two pieces
+            if code & FLAG_MASK == EN_PASSANT:
+                self.push(move)
+                illegal = self.is_square_attacked(king_pos, self.white_to_move)
+                self.pop()
+
+                if illegal:
+                    continue
+
+            moves.append(move)
+
+        self.board[king_pos[0]][king_pos[1]] = king
+
+        return moves
+
+    def copy(self) -> Board:
+        board = Board([rank.copy() for rank in self.board], False)
+
+        board.white_to_move = self.white_to_move
+        board.last_move = self.last_move
+        board.w_castle_k = self.w_castle_k
+        board.w_castle_q = self.w_castle_q
+        board.b_castle_k = self.b_castle_k
+        board.b_castle_q = self.b_castle_q
+        board.en_passant = self.en_passant
+        board.halfmove_clock = self.halfmove_clock
+        board.fullmove_number = self.fullmove_number
+        board.white_king = self.white_king
+        board.black_king = self.black_king
+        board.hash = self.hash
+        board.material = self.material
+        board.position = self.position
+        board.history = self.history.copy()
+
+        return board
+
+    def make_move(self, move: Move) -> Board:
+        # make the move on a copy so this board stays the same
+        board = self.copy()
+        board.push(move)
+
+        return board
+
+    def push(self, move: Move) -> None:
+        board = self.board
+        code = move.code
+        flags = code & FLAG_MASK
+        old_rank, old_file = code >> 3 & 7, code & 7
+        new_rank, new_file = code >> 9 & 7, code >> 6 & 7
+        piece = board[old_rank][old_file]
+
+        # en passant captures the pawn beside the moving pawn
+        captured_rank = old_rank if flags == EN_PASSANT else new_rank
+        captured = board[captured_rank][new_file]
+
+        # save everything needed to undo the move
+        self.history.append(
+            (
+                move,
+                piece,
+                captured,
+                (self.w_castle_k, self.w_castle_q, self.b_castle_k, self.b_castle_q),
+                self.en_passant,
+                self.white_king,
+                self.black_king,
+                self.last_move,
+                self.hash,
+                self.material,
+                self.position,
+                self.halfmove_clock,
+            )
+        )
+
+        # the clock for the fifty move rule restarts on captures and pawn moves
+        if captured or piece in ("P", "p"):
+            self.halfmove_clock = 0
+        else:
+            self.halfmove_clock += 1
+
+        # remove the moving piece and any captured piece from the hash
+        hash = self.hash ^ SIDE_KEY ^ self.castle_hash() ^ self.en_passant_hash()
+        hash ^= PIECE_KEYS[piece][old_rank][old_file]
+        if captured:
+            hash ^= PIECE_KEYS[captured][captured_rank][new_file]
+
+        # remove the moving piece and any captured piece from the score
+        material, position = self.material, self.position
+        position -= POSITION[piece][old_rank][old_file]
+        if captured:
+            material -= MATERIAL[captured]
+            position -= POSITION[captured][captured_rank][new_file]
+
+        # check if promotion
+        if code & PROMOTION:
+            promoted = PROMOTION_PIECES[code >> 12 & 3]
+            if not self.white_to_move:
+                promoted = promoted.lower()
+            material += MATERIAL[promoted] - MATERIAL[piece]
+            piece = promoted
+
+        # move the piece
+        board[captured_rank][new_file] = ""
+        board[new_rank][new_file] = piece
+        board[old_rank][old_file] = ""
+        hash ^= PIECE_KEYS[piece][new_rank][new_file]
+        position += POSITION[piece][new_rank][new_file]
+
+        # update additional information
+        self.last_move = move
+        self.white_to_move = not self.white_to_move
+
+        # the move number goes up after black moves
+        if self.white_to_move:
+            self.fullmove_number += 1
+
+        if flags == KING_CASTLE or flags == QUEEN_CASTLE:
+            castling = move.castling_type
+            if castling == "K":
+                board[7][5] = "R"
+                board[7][7] = ""
+                hash ^= PIECE_KEYS["R"][7][5] ^ PIECE_KEYS["R"][7][7]
+                position += POSITION["R"][7][5] - POSITION["R"][7][7]
+            elif castling == "Q":
+                board[7][3] = "R"
+                board[7][0] = ""
+                hash ^= PIECE_KEYS["R"][7][3] ^ PIECE_KEYS["R"][7][0]
+                position += POSITION["R"][7][3] - POSITION["R"][7][0]
+            elif castling == "k":
+                board[0][5] = "r"
+                board[0][7] = ""
+                hash ^= PIECE_KEYS["r"][0][5] ^ PIECE_KEYS["r"][0][7]
+                position += POSITION["r"][0][5] - POSITION["r"][0][7]
+            elif castling == "q":
+                board[0][3] = "r"
+                board[0][0] = ""
+                hash ^= PIECE_KEYS["r"][0][3] ^ PIECE_KEYS["r"][0][0]
+                position += POSITION["r"][0][3] - POSITION["r"][0][0]
+
+        # a pawn moving two squares can be captured en passant
+        self.en_passant = None
+        if piece in ("P", "p") and abs(new_rank - old_rank) == 2:
+            self.en_passant = ((old_rank + new_rank) // 2, old_file)
+
+        # update king location and castle rights if king moved
+        if piece == "K":
+            self.white_king = (new_rank, new_file)
+            self.w_castle_k = False
+            self.w_castle_q = False
+        elif piece == "k":
+            self.black_king = (new_rank, new_file)
+            self.b_castle_k = False
+            self.b_castle_q = False
+
+        # update castle rights if rooks moved from h1, a1, h8 or a8
+        elif piece == "R":
+            if code & 63 == 63:
+                self.w_castle_k = False
+            elif code & 63 == 56:
+                self.w_castle_q = False
+
+        elif piece == "r":
+            if code & 63 == 7:
+                self.b_castle_k = False
+            elif code & 63 == 0:
+                self.b_castle_q = False
+
+        # update castle rights if rooks were captured
+        if captured == "R":
+            if code >> 6 & 63 == 63:
+                self.w_castle_k = False
+            elif code >> 6 & 63 == 56:
+                self.w_castle_q = False
+
+        elif captured == "r":
+            if code >> 6 & 63 == 7:
+                self.b_castle_k = False
+            elif code >> 6 & 63 == 0:
+                self.b_castle_q = False
+
+        # add the new castle rights and en passant square to the hash
+        self.hash = hash ^ self.castle_hash() ^ self.en_passant_hash()
+        self.material, self.position = material, position
+
+    def pop(self) -> Move:
+        (
+            move,
+            piece,
+            captured,
+            castle_rights,
+            self.en_passant,
+            self.white_king,
+            self.black_king,
+            self.last_move,
+            self.hash,
+            self.material,
+            self.position,
+            self.halfmove_clock,
+        ) = self.history.pop()
+
+        # put back the moving piece and any captured piece
+        board = self.board
+        code = move.code
+        flags = code & FLAG_MASK
+        old_rank, new_rank, new_file = code >> 3 & 7, code >> 9 & 7, code >> 6 & 7
+        board[old_rank][code & 7] = piece
+        board[new_rank][new_file] = ""
+        captured_rank = old_rank if flags == EN_PASSANT else new_rank
+        board[captured_rank][new_file] = captured
+
+        # put back the rook if castling
+        if flags == KING_CASTLE or flags == QUEEN_CASTLE:
+            castling = move.castling_type
+            if castling == "K":
+                board[7][7] = "R"
+                board[7][5] = ""
+            elif castling == "Q":
+                board[7][0] = "R"
+                board[7][3] = ""
+            elif castling == "k":
+                board[0][7] = "r"
+                board[0][5] = ""
+            elif castling == "q":
+                board[0][0] = "r"
+                board[0][3] = ""
+
+        self.w_castle_k, self.w_castle_q, self.b_castle_k, self.b_castle_q = (
+            castle_rights
+        )
+        self.white_to_move = not self.white_to_move
+        if not self.white_to_move:
+            self.fullmove_number -= 1
+
+        return move
+
+    def can_move(
+        self, rank: int, file: int, can_attack: bool, must_attack: bool = False
+    ) -> bool:
+        # check if the position is not on the board
+        if not (0 <= rank <= 7 and 0 <= file <= 7):
+            return False  # position is off the board
+
+        piece = self.board[rank][file]
+
+        # if there is no piece there
+        if not piece:
+            # return false if must_attack, otherwise true
+            return not must_attack
+
+        if can_attack or must_attack:
+            # return true if the piece on the square is a different colour
+            return self.white_to_move != piece.isupper()
+
+        return False
+
+    def get_moves(self) -> list[Move]:
+        moves = []
+
+        for rank in range(8):
+            for file in range(8):
+                # get the piece
+                piece = self.board[rank][file]
+
+                # if there isn't a piece
+                if not piece:
+                    continue
+
+                # if the piece's colour is not the player to move
+                if self.white_to_move != piece.isupper():
+                    continue
+
+                if piece.upper() == "P":  # pawn
+                    first_rank = 6 if self.white_to_move else 1
+                    offset = -1 if self.white_to_move else 1
+                    new_rank = rank + offset
+
+                    # diagonal attack left and right, including en passant
+                    for new_file in (file - 1, file + 1):
+                        if self.can_move(new_rank, new_file, True, True):
+                            self.add_pawn_moves(moves, rank, file, new_rank, new_file)
+                        elif (new_rank, new_file) == self.en_passant:
+                            captured = self.board[rank][new_file]
+                            code = encode(
+                                rank * 8 + file, new_rank * 8 + new_file, EN_PASSANT
+                            )
+                            moves.append(Move(code, captured))
+
+                    # move one square up
+                    if self.can_move(new_rank, file, False):
+                        self.add_pawn_moves(moves, rank, file, new_rank, file)
+
+                        # if on first rank, move two squares up
+                        if rank == first_rank:
+                            if self.can_move(rank + offset * 2, file, False):
+                                new_square = (rank + offset * 2) * 8 + file
+                                moves.append(Move(encode(rank * 8 + file, new_square)))
+
+                elif piece.upper() == "N":  # knight
+                    moves.extend(self.get_piece_moves(rank, file, K_OFFSETS, False))
+
+                elif piece.upper() == "B":  # bishop
+                    moves.extend(self.get_piece_moves(rank, file, D_OFFSETS, True))
+
+                elif piece.upper() == "R":  # rook
+                    moves.extend(self.get_piece_moves(rank, file, C_OFFSETS, True))
+
+                elif piece.upper() == "Q":  # queen
+                    moves.extend(
+                        self.get_piece_moves(rank, file, C_OFFSETS + D_OFFSETS, True)
+                    )
+
+                elif piece.upper() == "K":  # king
+                    moves.extend(
+                        self.get_piece_moves(rank, file, C_OFFSETS + D_OFFSETS, False)
+                    )
+
+                    # castling
+                    if piece == "K" and (rank, file) == (7, 4):
+                        if self.w_castle_k:
+                            if (
+                                not self.board[7][5]
+                                and not self.board[7][6]
+                                and self.board[7][7] == "R"
+                            ):
+                                moves.append(Move(encode(60, 62, KING_CASTLE)))
+
+                        if self.w_castle_q:
+                            if (
+                                not self.board[7][3]
+                                and not self.board[7][2]
+                                and not self.board[7][1]
+                                and self.board[7][0] == "R"
+                            ):
+                                moves.append(Move(encode(60, 58, QUEEN_CASTLE)))
+
+                    elif piece == "k" and (rank, file) == (0, 4):
+                        if self.b_castle_k:
+                            if (
+                                not self.board[0][5]
+                                and not self.board[0][6]
+                                and self.board[0][7] == "r"
+                            ):
+                                moves.append(Move(encode(4, 6, KING_CASTLE)))
+
+                        if self.b_castle_q:
+                            if (
+                                not self.board[0][3]
+                                and not self.board[0][2]
+                                and not self.board[0][1]
+                                and self.board[0][0] == "r"
+                            ):
+                                moves.append(Move(encode(4, 2, QUEEN_CASTLE)))
+
+        return moves
+
+    def add_pawn_moves(
+        self, moves: list[Move], rank: int, file: int, new_rank: int, new_file: int
+    ) -> None:
+        captured = self.board[new_rank][new_file]
+        code = encode(rank * 8 + file, new_rank * 8 + new_file)
+        if captured:
+            code |= CAPTURE
+
+        # add a move for each promotion if moving to the last rank
+        if new_rank == 0 or new_rank == 7:
+            for promotion in "QRBN":
+                moves.append(Move(code | PROMOTION_FLAGS[promotion], captured))
+        else:
+            moves.append(Move(code, captured))
+
+    def get_piece_moves(
+        self, rank: int, file: int, offsets: list[tuple[int, int]], sliding: bool
+    ) -> list[Move]:
+        moves = []
+        square = rank * 8 + file
+
+        for offset in offsets:
+            # set the initial position to adding the offset
+            new_rank, new_file = rank + offset[0], file + offset[1]
+
+            # if the piece can slide, continue adding the move while it can
+            while self.can_move(new_rank, new_file, True):
+                captured = self.board[new_rank][new_file]
+                code = encode(
+                    square, new_rank * 8 + new_file, CAPTURE if captured else QUIET
+                )
+                moves.append(Move(code, captured))
+
+                # if you hit a piece, or not a sliding piece, exit loop
+                if captured or not sliding:
+                    break
+
+                # add new offset
+                new_rank, new_file = new_rank + offset[0], new_file + offset[1]
+
+        return moves
@@ -0,0 +1,121 @@
+import mmap
+import struct
+from core.board import Board
+from core.bitboard import BitBoard
+from core.move import Move
+
+# each entry is a hash, a move, a weight and four unused bytes, like polyglot books
+ENTRY = struct.Struct(">QHHI")
+
+# promotion pieces as numbered in the move
+PROMOTIONS = " NBRQ"
+
+
+def encode_move(move: Move) -> int:
+    # 3 bits each for the new file and row, old file and row, and the promotion
+    # rows count up from white's side, castling is written as the king's move
+    code = move.new_file | (7 - move.new_rank) << 3
+    code |= move.old_file << 6 | (7 - move.old_rank) << 9
+    if move.promotion:
+        code |= PROMOTIONS.index(move.promotion) << 12
+
+    return code
+
+
+def decode_move(code: int) -> str:
+    # convert back to long algebraic notation to compare with the legal moves
+    notation = (
+        "abcdefgh"[code >> 6 & 7]
+        + str((code >> 9 & 7) + 1)
+        + "abcdefgh"[code & 7]
+        + str((code >> 3 & 7) + 1)
+    )
+
+    promotion = code >> 12 & 7
+    if promotion:
+        notation += PROMOTIONS[promotion].lower()
+
+    return notation
+
+
+def write_book(path: str, weights: dict[tuple[int, int], int]) -> int:
+    # weights maps a hash and an encoded move to how often it should be played
+    entries = sorted(
+        (hash, move, min(weight, 0xFFFF))
+        for (hash, move), weight in weights.items()
+        if weight > 0
+    )
+
+    with open(path, "wb") as file:
+        for hash, move, weight in entries:
+            file.write(ENTRY.pack(hash, move, weight, 0))
+
+    return len(entries)
+
+
+class OpeningBook:
+    def __init__(self, path: str) -> None:
+        # the file is mapped rather than read, so processes share the same memory
+        self.file = open(path, "rb")
+        self.size = ENTRY.size
+
+        try:
+            self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # an empty file can't be mapped
+            self.data = b""
+
+        self.count = len(self.data) // self.size
+
+    def find(self, hash: int) -> int:
+        # binary search for the first entry of the position
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if ENTRY.unpack_from(self.data, middle * self.size)[0] < hash:
+                low = middle + 1
+            else:
+                high = middle
+
+        return low
+
+    def get_moves(self, board: Board | BitBoard) -> list[tuple[Move, int]]:
+        entries = []
+        index = self.find(board.hash)
+
+        # read every entry with the same hash
+        while index < self.count:
+            hash, move, weight, _ = ENTRY.unpack_from(self.data, index * self.size)
+            if hash != board.hash:
+                break
+            entries.append((decode_move(move), weight))
+            index += 1
+
+        if not entries:
+            return []
+
+        # only keep moves that are legal, in case two positions share a hash
+        legal_moves = {move.to_uci(): move for move in board.get_legal_moves()}
+        return [
+            (legal_moves[notation], weight)
+            for notation, weight in entries
+            if notation in legal_moves
+        ]
+
+    def choose_move(self, board: Board | BitBoard) -> Move | None:
+        moves = self.get_moves(board)
+        if not moves:
+            return None
+
+        # imported here to keep importing the engine fast
+        import random
+
+        # pick a move at random, more often the higher its weight
+        return random.choices(
+            [move for move, _ in moves], [weight for _, weight in moves]
+        )[0]
+
+    def close(self) -> None:
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        self.file.close()
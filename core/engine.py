@@ -0,0 +1,695 @@
+import time
+from core.board import Board
+from core.bitboard import BitBoard
+from core.move import Move, CAPTURE, PROMOTION
+from core.exchange import static_exchange
+from core.stats import SearchStats
+from core.book import OpeningBook
+from core.tablebase import Tablebases
+from core.transpositiontable import TranspositionTable, EXACT, LOWER, UPPER
+from core.constants import INFINITY, PIECE_VALUES
+
+# scores above this are a forced mate
+MATE_BOUND = INFINITY - 1000
+
+# the deepest ply killer moves are kept for
+MAX_PLY = 128
+
+# the order moves are searched in, quiet moves are ordered by their history score
+HASH_MOVE_SCORE = 3000000
+CAPTURE_SCORE = 2000000
+KILLER_SCORE = 1000000
+
+# the counters each worker sends back to be added to the main search's
+COUNTERS = (
+    "nodes",
+    "q_nodes",
+    "tt_probes",
+    "tt_hits",
+    "tb_hits",
+    "cutoffs",
+    "first_move_cutoffs",
+)
+
+
+class Engine:
+    def __init__(
+        self,
+        hash_size: int = 16,
+        replacement: str = "depth",
+        debug: bool = False,
+        workers: int = 1,
+        verbose: bool = True,
+        book: str | None = None,
+        tablebases: str | None = None,
+    ) -> None:
+        # check the incremental evaluation against a full rescan at every leaf
+        self.debug = debug
+
+        # print a summary after each search
+        self.verbose = verbose
+
+        # functions called with an event and the stats as the search progresses
+        self.callbacks = []
+        self.stats = SearchStats()
+
+        # the number of processes to split the root moves between
+        self.workers = workers
+        self.hash_size = hash_size
+
+        # a pool of one process for each worker, so a task can be sent to a chosen one
+        self.pools = []
+
+        # shared with the workers so a stop reaches them, and a number for each search
+        # so they know when to start a new one
+        self.stop_flag = None
+        self.search_id = 0
+
+        self.nodes = 0
+        self.q_nodes = 0
+        self.tt_probes = 0
+        self.tt_hits = 0
+        self.tb_hits = 0
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+        self.stopped = False
+        self.can_stop = False
+        self.start_time = 0.0
+        self.end_time = 0.0
+        self.max_time = 0.0
+
+        # pondering searches with no time limit until the predicted move is played
+        self.pondering = False
+        self.pv = []
+
+        # two quiet moves per ply that caused cutoffs, and a score per piece and square
+        self.killers = [[None, None] for ply in range(MAX_PLY)]
+        self.history = {
+            piece: [[0] * 8 for rank in range(8)] for piece in "PNBRQKpnbrqk"
+        }
+
+        self.tt = TranspositionTable(hash_size, replacement)
+
+        # moves from the opening book are played without searching
+        self.book = OpeningBook(book) if book else None
+
+        # endgames in the tablebases are looked up instead of searched
+        self.tablebases = Tablebases(tablebases) if tablebases else None
+        self.probe_all = False
+
+    def search(
+        self,
+        board: Board | BitBoard,
+        max_time: float = 3.0,
+        max_depth: int = 64,
+        ponder: bool = False,
+    ) -> Move | None:
+        start_time = time.time()
+        self.start_time = start_time
+        self.max_time = max_time
+        self.pondering = ponder
+        self.reset(float("inf") if ponder else start_time + max_time)
+        self.search_id += 1
+        if self.stop_flag is not None:
+            self.stop_flag.value = False
+
+        stats = SearchStats(board.white_to_move)
+        self.stats = stats
+        self.emit("start")
+
+        # play from the opening book while the position is in it
+        if self.book is not None:
+            move = self.book.choose_move(board)
+            if move is not None:
+                self.pv = [move]
+                stats.best_move, stats.pv, stats.book_move = move, self.pv, True
+                self.finish(start_time)
+                return move
+
+        self.new_search()
+
+        # with few enough pieces every position is probed, otherwise only after captures
+        if self.tablebases is not None:
+            pieces = self.tablebases.count_pieces(board)
+            self.probe_all = pieces <= self.tablebases.max_pieces
+
+        best_move, depth_reached = None, 0
+
+        # iterative deepening, only keep the result of completed iterations
+        for depth in range(1, max_depth + 1):
+            # the first iteration always runs to completion so there is a move to play
+            self.can_stop = depth > 1
+            iteration_start = time.time()
+            nodes, q_nodes = self.nodes, self.q_nodes
+
+            # the workers can't be told about a ponder hit, so ponder in this process
+            if self.workers > 1 and depth > 1 and not self.pondering:
+                eval, move = self.parallel_negamax(board, depth, best_move)
+            else:
+                eval, move = self.negamax(
+                    board, depth, -INFINITY, INFINITY, 0, best_move
+                )
+
+            # the last iteration ran out of time and is incomplete
+            if self.stopped:
+                break
+
+            best_move, depth_reached = move, depth
+
+            # record the iteration and report it
+            stats.best_move, stats.eval, stats.depth = move, eval, depth
+            stats.nodes_per_depth.append(self.nodes - nodes)
+            stats.q_nodes_per_depth.append(self.q_nodes - q_nodes)
+            stats.iteration_times.append(time.time() - iteration_start)
+            stats.pv = self.get_pv(board, depth)
+            self.update_stats(start_time)
+            self.emit("iteration")
+
+            # stop early if there is only one option or a forced mate is found
+            if move is None or abs(eval) >= MATE_BOUND:
+                break
+
+            # don't start an iteration that is unlikely to finish
+            if time.time() >= self.end_time:
+                break
+
+        # keep the principal variation, its second move is the reply to ponder on
+        self.pv = self.get_pv(board, depth_reached)
+        stats.pv = self.pv
+        self.finish(start_time)
+
+        return best_move
+
+    def add_callback(self, callback) -> None:
+        # called with "start", "iteration" or "finish" and the stats of the search
+        self.callbacks.append(callback)
+
+    def remove_callback(self, callback) -> None:
+        self.callbacks.remove(callback)
+
+    def emit(self, event: str) -> None:
+        for callback in self.callbacks:
+            callback(event, self.stats)
+
+    def update_stats(self, start_time: float) -> None:
+        # copy the counters, which are kept on the engine since that's faster to update
+        stats = self.stats
+        stats.nodes = self.nodes
+        stats.q_nodes = self.q_nodes
+        stats.tt_probes = self.tt_probes
+        stats.tt_hits = self.tt_hits
+        stats.tb_hits = self.tb_hits
+        stats.cutoffs = self.cutoffs
+        stats.first_move_cutoffs = self.first_move_cutoffs
+        stats.time = time.time() - start_time
+
+    def finish(self, start_time: float) -> None:
+        self.update_stats(start_time)
+        self.emit("finish")
+
+        if self.verbose:
+            print(self.stats.summary())
+
+    @property
+    def ponder_move(self) -> Move | None:
+        return self.pv[1] if len(self.pv) > 1 else None
+
+    def ponder_hit(self) -> None:
+        # the predicted move was played, so the search keeps the time it had left
+        self.pondering = False
+        self.end_time = self.start_time + self.max_time
+
+    def get_pv(self, board: Board | BitBoard, length: int) -> list[Move]:
+        pv = []
+        seen = set()
+
+        # follow the best moves in the transposition table
+        while len(pv) < length and board.hash not in seen:
+            seen.add(board.hash)
+            entry = self.tt.probe(board.hash)
+            if entry is None or entry[3] not in board.get_legal_moves():
+                break
+
+            pv.append(entry[3])
+            board.push(entry[3])
+
+        # restore the board
+        for move in pv:
+            board.pop()
+
+        return pv
+
+    def new_search(self) -> None:
+        self.tt.new_search()
+
+        # killers only apply to this search, and history ages between searches
+        self.killers = [[None, None] for ply in range(MAX_PLY)]
+        self.age_history()
+
+    def reset(self, end_time: float) -> None:
+        self.end_time = end_time
+        self.nodes = 0
+        self.q_nodes = 0
+        self.tt_probes = 0
+        self.tt_hits = 0
+        self.tb_hits = 0
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+        self.stopped = False
+
+    def parallel_negamax(
+        self, board: Board | BitBoard, depth: int, first_move: Move | None
+    ) -> tuple[int, Move | None]:
+        self.start_workers()
+
+        legal_moves = board.get_legal_moves()
+        moves = self.order_moves(board, legal_moves, first_move, 0)
+        if not moves:
+            return self.negamax(board, depth, -INFINITY, INFINITY, 0)
+
+        # the moves are generated in the same order every iteration, so each root move
+        # goes to the same worker and finds what it stored in the last iteration
+        pools = {
+            move: self.pools[i % len(self.pools)] for i, move in enumerate(legal_moves)
+        }
+
+        # search the first move alone to get a bound for the rest of the moves
+        best_eval, stopped, counters = pools[moves[0]].apply(
+            search_root_move,
+            (
+                board,
+                moves[0],
+                depth,
+                -INFINITY,
+                INFINITY,
+                self.end_time,
+                self.search_id,
+            ),
+        )
+        best_move = moves[0]
+        self.add_counters(counters)
+
+        if stopped or self.stopped:
+            self.stopped = True
+            return 0, None
+
+        # then search the rest of the moves on their workers at the same time
+        results = [
+            pools[move].apply_async(
+                search_root_move,
+                (
+                    board,
+                    move,
+                    depth,
+                    best_eval,
+                    INFINITY,
+                    self.end_time,
+                    self.search_id,
+                ),
+            )
+            for move in moves[1:]
+        ]
+
+        for move, result in zip(moves[1:], results):
+            eval, move_stopped, counters = result.get()
+            self.add_counters(counters)
+            stopped = stopped or move_stopped
+
+            # only a score above the bound is exact
+            if eval > best_eval:
+                best_eval = eval
+                best_move = move
+
+        if stopped:
+            self.stopped = True
+            return 0, None
+
+        # the workers have their own tables, so keep the root result for the pv
+        self.tt.store(board.hash, depth, EXACT, best_eval, best_move)
+
+        return best_eval, best_move
+
+    def get_counters(self) -> dict[str, int]:
+        return {name: getattr(self, name) for name in COUNTERS}
+
+    def add_counters(self, counters: dict[str, int]) -> None:
+        # add the counters from a worker's search to this one
+        for name, count in counters.items():
+            setattr(self, name, getattr(self, name) + count)
+
+    def start_workers(self) -> None:
+        # start the worker processes the first time they're needed
+        if not self.pools:
+            # imported here since it is most of the time to import the engine
+            import multiprocessing
+
+            # a plain shared byte, which is much faster to read than an event
+            self.stop_flag = multiprocessing.Value("b", False, lock=False)
+            self.pools = [
+                multiprocessing.Pool(
+                    1,
+                    initializer=init_worker,
+                    initargs=(self.hash_size, self.stop_flag),
+                )
+                for worker in range(self.workers)
+            ]
+
+    def stop(self) -> None:
+        # end the search as soon as possible, such as from another thread
+        self.stopped = True
+        self.can_stop = True
+
+        # the workers only see the shared flag
+        if self.stop_flag is not None:
+            self.stop_flag.value = True
+
+    def stop_workers(self) -> None:
+        # stop the worker processes
+        for pool in self.pools:
+            pool.terminate()
+        self.pools = []
+        self.stop_flag = None
+
+    def close(self) -> None:
+        self.stop_workers()
+
+        if self.book is not None:
+            self.book.close()
+            self.book = None
+
+        if self.tablebases is not None:
+            self.tablebases.close()
+            self.tablebases = None
+
+    def negamax(
+        self,
+        board: Board | BitBoard,
+        depth: int,
+        alpha: int,
+        beta: int,
+        ply: int,
+        first_move: Move | None = None,
+    ) -> tuple[int, Move | None]:
+        # use the tablebases once there are few enough pieces
+        if self.tablebases is not None and ply > 0:
+            if self.probe_all or board.last_move.captured:
+                result = self.tablebases.probe(board)
+                if result is not None:
+                    self.tb_hits += 1
+                    wdl, plies = result
+                    return wdl * (INFINITY - ply - plies), None
+
+        # only search captures at the horizon so exchanges aren't cut off
+        if depth == 0:
+            return self.quiescence(board, alpha, beta, ply), None
+
+        self.nodes += 1
+
+        # abort the search when out of time or told to stop by another process
+        if self.can_stop and time.time() >= self.end_time:
+            self.stopped = True
+        elif self.stop_flag is not None and self.stop_flag.value:
+            self.stopped = True
+
+        if self.stopped:
+            return 0, None
+
+        # a repeated position or the fifty move rule is a draw
+        if ply > 0 and (board.halfmove_clock >= 100 or board.is_repetition()):
+            return 0, None
+
+        # look up the position in the transposition table
+        hash_move = first_move
+        entry = self.tt.probe(board.hash)
+        self.tt_probes += 1
+        if entry is not None:
+            tt_depth, flag, score, tt_move = entry
+            score = self.score_from_tt(score, ply)
+            self.tt_hits += 1
+
+            # use the stored score if it was searched deep enough
+            if ply > 0 and tt_depth >= depth:
+                if flag == EXACT:
+                    return score, tt_move
+                if flag == LOWER and score >= beta:
+                    return score, tt_move
+                if flag == UPPER and score <= alpha:
+                    return score, tt_move
+
+            if hash_move is None:
+                hash_move = tt_move
+
+        moves = board.get_legal_moves()
+
+        # checkmate or stalemate, prefer the quickest mate
+        if not moves:
+            if board.in_check():
+                return -INFINITY + ply, None
+            return 0, None
+
+        moves = self.order_moves(board, moves, hash_move, ply)
+
+        original_alpha = alpha
+        best_eval = -INFINITY
+        best_move = None
+
+        for i, move in enumerate(moves):
+            board.push(move)
+            eval = -self.negamax(board, depth - 1, -beta, -alpha, ply + 1)[0]
+            board.pop()
+
+            if self.stopped:
+                return 0, None
+
+            if eval > best_eval:
+                best_eval = eval
+                best_move = move
+
+            # prune the rest of the moves since the opponent won't allow this line
+            alpha = max(alpha, eval)
+            if alpha >= beta:
+                self.cutoffs += 1
+                if i == 0:
+                    self.first_move_cutoffs += 1
+
+                # remember quiet moves that cause cutoffs
+                if not self.is_capture(move) and ply < MAX_PLY:
+                    self.update_killers(move, ply)
+                    piece = board.piece_at(move.old_rank, move.old_file)
+                    self.history[piece][move.new_rank][move.new_file] += depth * depth
+
+                break
+
+        # store what type of bound the result is
+        if best_eval <= original_alpha:
+            flag = UPPER
+        elif best_eval >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+
+        score = self.score_to_tt(best_eval, ply)
+        self.tt.store(board.hash, depth, flag, score, best_move)
+
+        return best_eval, best_move
+
+    def quiescence(
+        self, board: Board | BitBoard, alpha: int, beta: int, ply: int
+    ) -> int:
+        self.nodes += 1
+        self.q_nodes += 1
+
+        # abort the search when out of time or told to stop by another process
+        if self.can_stop and time.time() >= self.end_time:
+            self.stopped = True
+        elif self.stop_flag is not None and self.stop_flag.value:
+            self.stopped = True
+
+        if self.stopped:
+            return 0
+
+        # a long line of checks could otherwise go deeper than the killers are kept for
+        if ply >= MAX_PLY:
+            eval = self.evaluate(board)
+            return eval if board.white_to_move else -eval
+
+        # when in check every move has to be searched since standing pat isn't allowed
+        in_check = board.in_check()
+        if in_check:
+            moves = board.get_legal_moves()
+            if not moves:
+                return -INFINITY + ply
+
+            best_eval = -INFINITY
+
+        else:
+            # the side to move doesn't have to capture, so this is a lower bound
+            eval = self.evaluate(board)
+            best_eval = eval if board.white_to_move else -eval
+            if best_eval >= beta:
+                return best_eval
+            alpha = max(alpha, best_eval)
+
+            moves = board.get_legal_moves(captures_only=True)
+
+        for move in self.order_moves(board, moves, None, ply):
+            # skip captures that lose material
+            if not in_check and not move.code & PROMOTION:
+                piece = board.piece_at(move.code >> 3 & 7, move.code & 7)
+                if PIECE_VALUES[piece.upper()] > PIECE_VALUES[move.captured.upper()]:
+                    if static_exchange(board, move) < 0:
+                        continue
+
+            board.push(move)
+            eval = -self.quiescence(board, -beta, -alpha, ply + 1)
+            board.pop()
+
+            if self.stopped:
+                return 0
+
+            if eval > best_eval:
+                best_eval = eval
+
+            alpha = max(alpha, eval)
+            if alpha >= beta:
+                break
+
+        return best_eval
+
+    def is_capture(self, move: Move) -> bool:
+        return bool(move.code & (CAPTURE | PROMOTION))
+
+    def order_moves(
+        self,
+        board: Board | BitBoard,
+        moves: list[Move],
+        hash_move: Move | None,
+        ply: int,
+    ) -> list[Move]:
+        killers = self.killers[ply] if ply < MAX_PLY else [None, None]
+        hash_code = hash_move.code if hash_move is not None else None
+        scores = []
+
+        # moves are compared by their codes, which is faster than comparing moves
+        for move in moves:
+            code = move.code
+            piece = board.piece_at(code >> 3 & 7, code & 7)
+
+            # the hash move, then captures, then killers, then quiet moves
+            if code == hash_code:
+                score = HASH_MOVE_SCORE
+            elif code & (CAPTURE | PROMOTION):
+                # most valuable victim, least valuable attacker
+                score = CAPTURE_SCORE - PIECE_VALUES[piece.upper()] // 10
+                if move.captured:
+                    score += PIECE_VALUES[move.captured.upper()] * 10
+                if code & PROMOTION:
+                    score += PIECE_VALUES[move.promotion] * 10
+            elif code == killers[0]:
+                score = KILLER_SCORE + 1
+            elif code == killers[1]:
+                score = KILLER_SCORE
+            else:
+                score = self.history[piece][code >> 9 & 7][code >> 6 & 7]
+
+            scores.append(score)
+
+        # sort by score, keeping the generated order for ties
+        order = sorted(range(len(moves)), key=scores.__getitem__, reverse=True)
+        return [moves[i] for i in order]
+
+    def update_killers(self, move: Move, ply: int) -> None:
+        killers = self.killers[ply]
+
+        # keep the codes of the two most recent killers without duplicates
+        if move.code != killers[0]:
+            killers[1] = killers[0]
+            killers[0] = move.code
+
+    def age_history(self) -> None:
+        # halve the history so older searches matter less
+        for table in self.history.values():
+            for rank in table:
+                for file in range(8):
+                    rank[file] //= 2
+
+    def score_to_tt(self, score: int, ply: int) -> int:
+        # store mate scores relative to the position instead of the root
+        if score >= MATE_BOUND:
+            return score + ply
+        if score <= -MATE_BOUND:
+            return score - ply
+        return score
+
+    def score_from_tt(self, score: int, ply: int) -> int:
+        # convert mate scores back to be relative to the root
+        if score >= MATE_BOUND:
+            return score - ply
+        if score <= -MATE_BOUND:
+            return score + ply
+        return score
+
+    def evaluate(self, board: Board | BitBoard) -> int:
+        # the board keeps the material and position scores up to date as moves are made
+        if self.debug:
+            if (board.material, board.position) != board.compute_score():
+                raise RuntimeError(
+                    f"Incremental evaluation {(board.material, board.position)} "
+                    f"doesn't match rescan {board.compute_score()}"
+                )
+
+        return board.material + board.position
+
+    def evaluate_frontier(
+        self,
+        frontier: list[tuple[Board | BitBoard, list[Move]]],
+        vectorized: bool = True,
+    ) -> list[int]:
+        # imported here since numpy is slow to import and only needed for analysis
+        from core.batch import encode_node, score_moves
+
+        # score every child from the change its move makes, without making the moves
+        nodes = [encode_node(board, moves) for board, moves in frontier]
+        return score_moves(nodes, vectorized)
+
+    def evaluate_children(
+        self, board: Board | BitBoard, moves: list[Move], vectorized: bool = False
+    ) -> list[int]:
+        # numpy only pays off over many positions, so one is scored without it
+        return self.evaluate_frontier([(board, moves)], vectorized)
+
+
+# the engine used by each worker process in a parallel search
+worker_engine = None
+
+
+def init_worker(hash_size: int, stop_flag) -> None:
+    global worker_engine
+    worker_engine = Engine(hash_size, verbose=False)
+    worker_engine.stop_flag = stop_flag
+
+
+def search_root_move(
+    board: Board | BitBoard,
+    move: Move,
+    depth: int,
+    alpha: int,
+    beta: int,
+    end_time: float,
+    search_id: int,
+) -> tuple[int, bool, dict[str, int]]:
+    engine = worker_engine
+    engine.reset(end_time)
+    engine.can_stop = True
+
+    # age the table and history the first time each search reaches this worker
+    if engine.search_id != search_id:
+        engine.search_id = search_id
+        engine.new_search()
+
+    # search the position after the move, return the score, if it stopped and counters
+    board.push(move)
+    eval = -engine.negamax(board, depth - 1, -beta, -alpha, 1)[0]
+    board.pop()
+
+    return eval, engine.stopped, engine.get_counters()
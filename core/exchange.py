@@ -0,0 +1,106 @@
+from core.board import Board
+from core.bitboard import BitBoard
+from core.move import Move
+from core.constants import K_OFFSETS, C_OFFSETS, D_OFFSETS, PIECE_VALUES
+
+
+def get_attackers(
+    board: Board | BitBoard, rank: int, file: int
+) -> tuple[list[str], dict[tuple[int, int], list[str]]]:
+    knights = []
+    lines = {}
+
+    # knights can't be blocked so they always attack the square
+    for rank_offset, file_offset in K_OFFSETS:
+        new_rank, new_file = rank + rank_offset, file + file_offset
+        if 0 <= new_rank <= 7 and 0 <= new_file <= 7:
+            piece = board.piece_at(new_rank, new_file)
+            if piece in ("N", "n"):
+                knights.append(piece)
+
+    # along each line, pieces behind an attacker can attack once it has captured
+    for offsets, sliders in ((C_OFFSETS, "RQrq"), (D_OFFSETS, "BQbq")):
+        for rank_offset, file_offset in offsets:
+            new_rank, new_file = rank + rank_offset, file + file_offset
+            line = []
+
+            # the pawn that attacks the square from this direction
+            pawn = ""
+            if offsets is D_OFFSETS:
+                pawn = "P" if rank_offset == 1 else "p"
+
+            # kings and pawns only attack from the next square
+            piece = ""
+            if 0 <= new_rank <= 7 and 0 <= new_file <= 7:
+                piece = board.piece_at(new_rank, new_file)
+                if piece in ("K", "k") or (piece and piece == pawn):
+                    line.append(piece)
+                    new_rank, new_file = new_rank + rank_offset, new_file + file_offset
+
+            while 0 <= new_rank <= 7 and 0 <= new_file <= 7:
+                piece = board.piece_at(new_rank, new_file)
+
+                if piece:
+                    if piece not in sliders:
+                        break
+                    line.append(piece)
+
+                new_rank, new_file = new_rank + rank_offset, new_file + file_offset
+
+            lines[(rank_offset, file_offset)] = line
+
+    return knights, lines
+
+
+def static_exchange(board: Board | BitBoard, move: Move) -> int:
+    # decode the squares from the move's code, without building tuples
+    code = move.code
+    old_rank, old_file = code >> 3 & 7, code & 7
+    new_rank, new_file = code >> 9 & 7, code >> 6 & 7
+    knights, lines = get_attackers(board, new_rank, new_file)
+    piece = board.piece_at(old_rank, old_file)
+
+    # remove the piece making the capture from the attackers
+    if piece in ("N", "n"):
+        knights.remove(piece)
+    else:
+        rank_offset = (old_rank > new_rank) - (old_rank < new_rank)
+        file_offset = (old_file > new_file) - (old_file < new_file)
+        lines[(rank_offset, file_offset)].pop(0)
+
+    # the material gained after each capture, from the side that captured
+    gains = [PIECE_VALUES[move.captured.upper()] if move.captured else 0]
+    on_square = PIECE_VALUES[piece.upper()]
+    white = not piece.isupper()
+
+    while True:
+        # find the least valuable attacker for the side to capture
+        best_value, best_line = None, None
+        for knight in knights:
+            if knight.isupper() == white:
+                best_value, best_line = PIECE_VALUES["N"], knights
+                break
+
+        for line in lines.values():
+            if line and line[0].isupper() == white:
+                value = PIECE_VALUES[line[0].upper()]
+                if best_value is None or value < best_value:
+                    best_value, best_line = value, line
+
+        if best_value is None:
+            break
+
+        # capture the piece on the square
+        gains.append(on_square - gains[-1])
+        on_square = best_value
+        if best_line is knights:
+            knights.remove("N" if white else "n")
+        else:
+            best_line.pop(0)
+        white = not white
+
+    # each side can choose to stop capturing if it would lose material
+    for i in range(len(gains) - 1, 0, -1):
+        gains[i - 1] = -max(-gains[i - 1], gains[i])
+
+    return gains[0]
@@ -0,0 +1,108 @@
+# the fen of the starting chess position
+START_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+
+
+def parse_square(square: str) -> tuple[int, int]:
+    # convert a square such as e3 to a rank and file
+    return (8 - int(square[1]), "abcdefgh".index(square[0]))
+
+
+def parse_fen(
+    fen: str,
+) -> tuple[list[list[str]], bool, str, tuple[int, int] | None, int, int]:
+    fields = fen.split()
+    if len(fields) < 4:
+        raise ValueError(f"Invalid FEN: {fen}")
+
+    # read each rank, where numbers are a count of empty squares
+    board = []
+    for row in fields[0].split("/"):
+        rank = []
+        for char in row:
+            if char.isdigit():
+                rank.extend([""] * int(char))
+            elif char in "PNBRQKpnbrqk":
+                rank.append(char)
+            else:
+                raise ValueError(f"Invalid piece '{char}' in FEN: {fen}")
+
+        if len(rank) != 8:
+            raise ValueError(f"Invalid rank '{row}' in FEN: {fen}")
+        board.append(rank)
+
+    if len(board) != 8:
+        raise ValueError(f"Invalid number of ranks in FEN: {fen}")
+
+    white_to_move = fields[1] == "w"
+    castling = "" if fields[2] == "-" else fields[2]
+    en_passant = None if fields[3] == "-" else parse_square(fields[3])
+
+    # the move counters are optional, such as in EPD
+    halfmove_clock = int(fields[4]) if len(fields) > 4 and fields[4].isdigit() else 0
+    fullmove_number = int(fields[5]) if len(fields) > 5 and fields[5].isdigit() else 1
+
+    return board, white_to_move, castling, en_passant, halfmove_clock, fullmove_number
+
+
+def load_fen(backend: type, fen: str):
+    (
+        board,
+        white_to_move,
+        castling,
+        en_passant,
+        halfmove_clock,
+        fullmove_number,
+    ) = parse_fen(fen)
+
+    # create the board and replace the starting options
+    board = backend(board, True)
+    board.white_to_move = white_to_move
+    board.w_castle_k = "K" in castling
+    board.w_castle_q = "Q" in castling
+    board.b_castle_k = "k" in castling
+    board.b_castle_q = "q" in castling
+    board.en_passant = en_passant
+    board.halfmove_clock = halfmove_clock
+    board.fullmove_number = max(fullmove_number, 1)
+    board.hash = board.compute_hash()
+
+    return board
+
+
+def dump_fen(board) -> str:
+    # write each rank, counting empty squares
+    rows = []
+    for rank in board.board:
+        row = ""
+        empty = 0
+        for piece in rank:
+            if piece:
+                row += (str(empty) if empty else "") + piece
+                empty = 0
+            else:
+                empty += 1
+        rows.append(row + (str(empty) if empty else ""))
+
+    castling = "".join(
+        char
+        for char, allowed in zip(
+            "KQkq",
+            (board.w_castle_k, board.w_castle_q, board.b_castle_k, board.b_castle_q),
+        )
+        if allowed
+    )
+    en_passant = "-"
+    if board.en_passant is not None:
+        rank, file = board.en_passant
+        en_passant = "abcdefgh"[file] + str(8 - rank)
+
+    return " ".join(
+        (
+            "/".join(rows),
+            "w" if board.white_to_move else "b",
+            castling or "-",
+            en_passant,
+            str(board.halfmove_clock),
+            str(board.fullmove_number),
+        )
+    )
@@ -0,0 +1,176 @@
+import os
+import sys
+import threading
+import time
+import core.engine
+from core.board import Board
+from core.bitboard import BitBoard
+from core.engine import Engine
+from core.transpositiontable import TranspositionTable
+
+# the functions timed in each phase, as the object they're found on and their name
+PHASES = {
+    "get_moves": [(Board, "get_moves"), (BitBoard, "get_moves")],
+    "get_legal_moves": [(Board, "get_legal_moves"), (BitBoard, "get_legal_moves")],
+    "can_attack_king": [(Board, "can_attack_king"), (BitBoard, "can_attack_king")],
+    "in_check": [(Board, "in_check"), (BitBoard, "in_check")],
+    "make_move": [(Board, "make_move"), (BitBoard, "make_move")],
+    "push": [(Board, "push"), (BitBoard, "push")],
+    "pop": [(Board, "pop"), (BitBoard, "pop")],
+    "negamax": [(Engine, "negamax")],
+    "quiescence": [(Engine, "quiescence")],
+    "order_moves": [(Engine, "order_moves")],
+    "evaluate": [(Engine, "evaluate")],
+    "static_exchange": [(core.engine, "static_exchange")],
+    "tt_probe": [(TranspositionTable, "probe")],
+    "tt_store": [(TranspositionTable, "store")],
+}
+
+# the folder of the engine, stacks outside it such as waiting for input are skipped
+CORE_FOLDER = os.path.dirname(os.path.abspath(core.engine.__file__))
+
+
+class Profiler:
+    def __init__(
+        self, phases: list[str] | None = None, interval: float = 0.001
+    ) -> None:
+        # nothing is changed until the profiler starts, so it costs nothing until then
+        self.phases = phases if phases is not None else list(PHASES)
+        self.interval = interval
+
+        self.calls = {phase: 0 for phase in self.phases}
+        self.total_time = {phase: 0.0 for phase in self.phases}
+        self.self_time = {phase: 0.0 for phase in self.phases}
+
+        # the time spent in timed functions called by each timed function on the stack
+        # shared by every wrapper in a thread so nested phases aren't counted twice
+        self.local = threading.local()
+
+        # the collapsed stacks seen by the sampler and how often each was seen
+        self.samples = {}
+
+        self.originals = []
+        self.sampler = None
+        self.running = False
+        self.start_time = 0.0
+        self.elapsed = 0.0
+
+    def start(self) -> None:
+        if self.running:
+            return
+
+        self.running = True
+        self.start_time = time.perf_counter()
+
+        # replace each function with one that times it, until the profiler stops
+        for phase in self.phases:
+            for owner, name in PHASES[phase]:
+                function = getattr(owner, name)
+                self.originals.append((owner, name, function))
+                setattr(owner, name, self.wrap(phase, function))
+
+        self.sampler = threading.Thread(target=self.sample, daemon=True)
+        self.sampler.start()
+
+    def stop(self) -> None:
+        if not self.running:
+            return
+
+        self.running = False
+        self.sampler.join()
+        self.elapsed += time.perf_counter() - self.start_time
+
+        # put back the original functions
+        for owner, name, function in reversed(self.originals):
+            setattr(owner, name, function)
+        self.originals = []
+
+    def wrap(self, phase: str, function):
+        calls, total_time, self_time = self.calls, self.total_time, self.self_time
+        local = self.local
+        perf_counter = time.perf_counter
+
+        def timed(*args, **kwargs):
+            stack = local.__dict__.setdefault("stack", [])
+            active = local.__dict__.setdefault("active", {})
+            active[phase] = active.get(phase, 0) + 1
+            stack.append(0.0)
+            start_time = perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                elapsed = perf_counter() - start_time
+                calls[phase] += 1
+                active[phase] -= 1
+
+                # recursive calls are inside the outermost one, so only it is counted
+                if not active[phase]:
+                    total_time[phase] += elapsed
+                self_time[phase] += elapsed - stack.pop()
+                if stack:
+                    stack[-1] += elapsed
+
+        return timed
+
+    def sample(self) -> None:
+        # record the stack of every thread running the engine at a regular interval
+        own_id = threading.get_ident()
+
+        while self.running:
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+
+                stack = []
+                inside = False
+                while frame is not None:
+                    code = frame.f_code
+
+                    # leave out the timing wrappers
+                    if code.co_filename != __file__:
+                        inside = inside or code.co_filename.startswith(CORE_FOLDER)
+                        name = os.path.basename(code.co_filename)
+                        stack.append(f"{code.co_name} ({name}:{code.co_firstlineno})")
+                    frame = frame.f_back
+
+                if inside:
+                    key = ";".join(reversed(stack))
+                    self.samples[key] = self.samples.get(key, 0) + 1
+
+            time.sleep(self.interval)
+
+    def report(self) -> str:
+        elapsed = self.elapsed or time.perf_counter() - self.start_time
+        lines = [
+            f"{'Phase':<16} {'Calls':>10} {'Total (s)':>10} {'Self (s)':>10} "
+            f"{'Self %':>7} {'Self/Call (us)':>15}"
+        ]
+
+        # the phases that took the most time on their own first
+        for phase in sorted(self.phases, key=self.self_time.get, reverse=True):
+            calls = self.calls[phase]
+            if not calls:
+                continue
+
+            lines.append(
+                f"{phase:<16} {calls:>10} {self.total_time[phase]:>10.3f} "
+                f"{self.self_time[phase]:>10.3f} "
+                f"{self.self_time[phase] / max(elapsed, 1e-9) * 100:>7.1f} "
+                f"{self.self_time[phase] / calls * 1e6:>15.1f}"
+            )
+
+        lines.append(
+            f"Profiled Time: {round(elapsed, 3)}s, Samples: {self.sample_count}"
+        )
+        return "\n".join(lines)
+
+    @property
+    def sample_count(self) -> int:
+        return sum(self.samples.values())
+
+    def write_flamegraph(self, path: str) -> None:
+        # one line per stack of functions separated by semicolons, then its count
+        # which flamegraph.pl, speedscope and similar tools can read
+        with open(path, "w") as file:
+            for stack, count in sorted(self.samples.items()):
+                file.write(f"{stack} {count}\n")
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+# a move is packed into 16 bits, 6 for each square and 4 for the flags
+# squares are numbered rank * 8 + file, from a8 as 0 to h1 as 63
+TO_SHIFT = 6
+SQUARE_MASK = 0x3F
+
+# the flags in the top 4 bits, promotions keep the piece in the lower two
+QUIET = 0
+KING_CASTLE = 2 << 12
+QUEEN_CASTLE = 3 << 12
+CAPTURE = 4 << 12
+EN_PASSANT = 5 << 12
+PROMOTION = 8 << 12
+FLAG_MASK = 0xF << 12
+
+# the promotion pieces in the order they're numbered in the flags
+PROMOTION_PIECES = "NBRQ"
+PROMOTION_FLAGS = {
+    piece: PROMOTION | index << 12 for index, piece in enumerate(PROMOTION_PIECES)
+}
+
+
+def encode(old_square: int, new_square: int, flags: int = QUIET) -> int:
+    return old_square | new_square << TO_SHIFT | flags
+
+
+class Move:
+    # only the code and the captured piece are stored, which keeps moves cheap to make
+    __slots__ = ("code", "captured")
+
+    def __init__(self, code: int, captured: str = "") -> None:
+        self.code = code
+
+        # the piece captured by the move, if any, which is needed to order moves
+        self.captured = captured
+
+    @classmethod
+    def from_squares(
+        cls,
+        old_rank: int,
+        old_file: int,
+        new_rank: int,
+        new_file: int,
+        castling_type: str | None = None,
+        promotion: str | None = None,
+        en_passant: bool = False,
+        captured: str = "",
+    ) -> Move:
+        if castling_type:
+            flags = KING_CASTLE if castling_type in "Kk" else QUEEN_CASTLE
+        elif en_passant:
+            flags = EN_PASSANT
+        elif promotion:
+            flags = PROMOTION_FLAGS[promotion] | (CAPTURE if captured else 0)
+        else:
+            flags = CAPTURE if captured else QUIET
+
+        code = encode(old_rank * 8 + old_file, new_rank * 8 + new_file, flags)
+        return cls(code, captured)
+
+    @property
+    def old_square(self) -> int:
+        return self.code & SQUARE_MASK
+
+    @property
+    def new_square(self) -> int:
+        return self.code >> TO_SHIFT & SQUARE_MASK
+
+    @property
+    def old_rank(self) -> int:
+        return self.code >> 3 & 7
+
+    @property
+    def old_file(self) -> int:
+        return self.code & 7
+
+    @property
+    def new_rank(self) -> int:
+        return self.code >> 9 & 7
+
+    @property
+    def new_file(self) -> int:
+        return self.code >> 6 & 7
+
+    @property
+    def old_pos(self) -> tuple[int, int]:
+        return (self.code >> 3 & 7, self.code & 7)
+
+    @property
+    def new_pos(self) -> tuple[int, int]:
+        return (self.code >> 9 & 7, self.code >> 6 & 7)
+
+    @property
+    def castling_type(self) -> str | None:
+        flags = self.code & FLAG_MASK
+        if flags != KING_CASTLE and flags != QUEEN_CASTLE:
+            return None
+
+        # white castles from the last rank
+        castling_type = "K" if flags == KING_CASTLE else "Q"
+        return castling_type if self.code >> 3 & 7 == 7 else castling_type.lower()
+
+    @property
+    def promotion(self) -> str | None:
+        # the promotion piece is in uppercase
+        if self.code & PROMOTION:
+            return PROMOTION_PIECES[self.code >> 12 & 3]
+        return None
+
+    @property
+    def en_passant(self) -> bool:
+        return self.code & FLAG_MASK == EN_PASSANT
+
+    def to_uci(self) -> str:
+        # convert to long algebraic notation, such as e2e4 or e7e8q
+        notation = (
+            "abcdefgh"[self.old_file]
+            + str(8 - self.old_rank)
+            + "abcdefgh"[self.new_file]
+            + str(8 - self.new_rank)
+        )
+
+        if self.promotion:
+            notation += self.promotion.lower()
+
+        return notation
+
+    def __repr__(self) -> str:
+        return f"{self.old_pos} to {self.new_pos}"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Move):
+            return NotImplemented
+
+        return self.code == other.code
+
+    def __hash__(self) -> int:
+        return self.code
@@ -0,0 +1,15 @@
+from core.constants import PIECE_VALUES, PIECE_TABLES
+
+# the value of each piece, positive for white and negative for black
+MATERIAL = {}
+
+# the value of each piece on each square, positive for white and negative for black
+POSITION = {}
+
+for piece, table in PIECE_TABLES.items():
+    MATERIAL[piece] = PIECE_VALUES[piece]
+    MATERIAL[piece.lower()] = -PIECE_VALUES[piece]
+
+    # reverse the order of the outer list in each table for black
+    POSITION[piece] = table
+    POSITION[piece.lower()] = [[-value for value in rank] for rank in table[::-1]]
@@ -0,0 +1,40 @@
+from core.board import Board
+from core.bitboard import BitBoard
+from core.move import Move
+
+# results from white's point of view, as written in PGN
+WHITE_WIN = "1-0"
+BLACK_WIN = "0-1"
+DRAW = "1/2-1/2"
+
+
+def insufficient_material(board: Board | BitBoard) -> bool:
+    pieces = [piece for rank in board.board for piece in rank if piece]
+
+    # only kings, or kings and a single knight or bishop, can't checkmate
+    if len(pieces) == 2:
+        return True
+    return len(pieces) == 3 and any(piece in "NBnb" for piece in pieces)
+
+
+def game_result(
+    board: Board | BitBoard, moves: list[Move] | None = None
+) -> tuple[str, str] | None:
+    # the legal moves can be passed in if they were already generated
+    if moves is None:
+        moves = board.get_legal_moves()
+
+    if not moves:
+        if board.in_check():
+            return (BLACK_WIN if board.white_to_move else WHITE_WIN), "checkmate"
+        return DRAW, "stalemate"
+
+    if board.halfmove_clock >= 100:
+        return DRAW, "fifty move rule"
+    if board.is_repetition(2):
+        return DRAW, "repetition"
+    if insufficient_material(board):
+        return DRAW, "insufficient material"
+
+    # the game isn't over
+    return None
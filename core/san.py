@@ -0,0 +1,70 @@
+from core.board import Board
+from core.bitboard import BitBoard
+from core.move import Move
+
+
+def square_name(rank: int, file: int) -> str:
+    return "abcdefgh"[file] + str(8 - rank)
+
+
+def to_san(board: Board | BitBoard, move: Move, moves: list[Move]) -> str:
+    # moves is every legal move, which is needed to tell apart pieces of the same type
+    if move.castling_type:
+        san = "O-O" if move.castling_type in "Kk" else "O-O-O"
+    else:
+        piece = board.piece_at(move.old_rank, move.old_file).upper()
+        capture = "x" if move.captured else ""
+        target = square_name(move.new_rank, move.new_file)
+
+        if piece == "P":
+            # pawn captures are written with the file they came from
+            san = ("abcdefgh"[move.old_file] + capture if capture else "") + target
+            if move.promotion:
+                san += "=" + move.promotion
+        else:
+            # other pieces of the same type that could move to the same square
+            others = [
+                other.old_pos
+                for other in moves
+                if other.new_pos == move.new_pos
+                and other.old_pos != move.old_pos
+                and board.piece_at(other.old_rank, other.old_file).upper() == piece
+            ]
+
+            # use the file, then the rank, then both to tell them apart
+            origin = ""
+            if others:
+                if all(file != move.old_file for _, file in others):
+                    origin = "abcdefgh"[move.old_file]
+                elif all(rank != move.old_rank for rank, _ in others):
+                    origin = str(8 - move.old_rank)
+                else:
+                    origin = square_name(move.old_rank, move.old_file)
+
+            san = piece + origin + capture + target
+
+    # add whether the move gives check or checkmate
+    board.push(move)
+    if board.in_check():
+        san += "#" if not board.get_legal_moves() else "+"
+    board.pop()
+
+    return san
+
+
+def clean_san(san: str) -> str:
+    # remove check marks, annotations and promotion signs so notation can be compared
+    san = san.rstrip("+#!?").replace("=", "")
+    return san.replace("0-0-0", "O-O-O").replace("0-0", "O-O")
+
+
+def parse_san(board: Board | BitBoard, san: str) -> Move | None:
+    # find the legal move written this way, or None if there isn't one
+    moves = board.get_legal_moves()
+    target = clean_san(san)
+
+    for move in moves:
+        if clean_san(to_san(board, move, moves)) == target:
+            return move
+
+    return None
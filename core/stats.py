@@ -0,0 +1,93 @@
+class SearchStats:
+    def __init__(self, white_to_move: bool = True) -> None:
+        # the result of the deepest completed iteration, the eval is for the side to move
+        self.white_to_move = white_to_move
+        self.best_move = None
+        self.eval = 0
+        self.depth = 0
+        self.pv = []
+        self.book_move = False
+
+        # one entry for each completed iteration
+        self.nodes_per_depth = []
+        self.q_nodes_per_depth = []
+        self.iteration_times = []
+
+        # totals for the whole search, including an unfinished last iteration
+        self.nodes = 0
+        self.q_nodes = 0
+        self.time = 0.0
+        self.tt_probes = 0
+        self.tt_hits = 0
+        self.tb_hits = 0
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+
+    @property
+    def nps(self) -> int:
+        return round(self.nodes / max(self.time, 1e-9))
+
+    @property
+    def branching_factor(self) -> float:
+        # how many times more nodes the last iteration took than the one before
+        if len(self.nodes_per_depth) < 2 or not self.nodes_per_depth[-2]:
+            return 0.0
+        return self.nodes_per_depth[-1] / self.nodes_per_depth[-2]
+
+    @property
+    def tt_hit_rate(self) -> float:
+        return self.tt_hits / self.tt_probes if self.tt_probes else 0.0
+
+    @property
+    def first_move_cutoff_rate(self) -> float:
+        return self.first_move_cutoffs / self.cutoffs if self.cutoffs else 0.0
+
+    def as_dict(self) -> dict:
+        # plain values, such as to write as JSON
+        return {
+            "best_move": self.best_move.to_uci() if self.best_move else None,
+            "eval": self.eval,
+            "depth": self.depth,
+            "pv": [move.to_uci() for move in self.pv],
+            "book_move": self.book_move,
+            "nodes_per_depth": self.nodes_per_depth,
+            "q_nodes_per_depth": self.q_nodes_per_depth,
+            "iteration_times": [round(seconds, 6) for seconds in self.iteration_times],
+            "nodes": self.nodes,
+            "q_nodes": self.q_nodes,
+            "time": round(self.time, 6),
+            "nps": self.nps,
+            "branching_factor": round(self.branching_factor, 3),
+            "tt_probes": self.tt_probes,
+            "tt_hits": self.tt_hits,
+            "tb_hits": self.tb_hits,
+            "cutoffs": self.cutoffs,
+            "first_move_cutoffs": self.first_move_cutoffs,
+        }
+
+    def summary(self) -> str:
+        if self.book_move:
+            return f"Book Move: {self.best_move.to_uci()}\n"
+
+        # convert to white's perspective to report the evaluation
+        eval = self.eval if self.white_to_move else -self.eval
+        if eval > 0:
+            lines = [f"White is up {round(eval / 100, 2)} pieces!"]
+        else:
+            lines = [f"Black is up {round(-eval / 100, 2)} pieces!"]
+
+        lines.append(f"Depth: {self.depth}, Nodes: {self.nodes}")
+        lines.append(f"Quiescence Nodes: {self.q_nodes}")
+        lines.append(f"TT Probes: {self.tt_probes}, TT Hits: {self.tt_hits}")
+        if self.tb_hits:
+            lines.append(f"Tablebase Hits: {self.tb_hits}")
+        lines.append(f"Nodes per Second: {self.nps}")
+        lines.append(f"Branching Factor: {round(self.branching_factor, 2)}")
+        if self.cutoffs:
+            rate = round(self.first_move_cutoff_rate * 100, 1)
+            lines.append(f"Cutoffs: {self.cutoffs}, on First Move: {rate}%")
+        if self.pv:
+            lines.append(f"PV: {' '.join(move.to_uci() for move in self.pv)}")
+        lines.append(f"Computer Move Time: {round(self.time, 3)}\n")
+
+        return "\n".join(lines)
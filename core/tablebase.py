@@ -0,0 +1,152 @@
+import mmap
+import os
+from core.board import Board
+from core.bitboard import BitBoard
+from core.constants import PIECE_VALUES
+
+# each file is this header followed by one byte per position
+MAGIC = b"TB01"
+
+# the order pieces are listed in the name of an endgame, such as KQKR
+PIECE_ORDER = "KQRBNP"
+
+
+def split_name(name: str) -> tuple[str, str]:
+    # the white pieces come first, and each side starts with its king
+    index = name.index("K", 1)
+    return name[:index], name[index:]
+
+
+def sort_pieces(pieces: str) -> str:
+    return "".join(sorted(pieces.upper(), key=PIECE_ORDER.index))
+
+
+def is_flipped(white: str, black: str) -> bool:
+    # tables are stored with the stronger side as white
+    def strength(pieces: str) -> tuple[int, list[int]]:
+        value = sum(PIECE_VALUES[piece] for piece in pieces if piece != "K")
+        return value, [-PIECE_ORDER.index(piece) for piece in pieces]
+
+    return strength(black) > strength(white)
+
+
+def is_drawn(white: str, black: str) -> bool:
+    # a lone king can't be mated by a single knight or bishop
+    return (white == "K" and black in ("K", "KB", "KN")) or (
+        black == "K" and white in ("KB", "KN")
+    )
+
+
+def table_size(count: int) -> int:
+    # the white king is on the left half of the board, then any square for the rest
+    return 32 * 64 ** (count - 1) * 2
+
+
+def encode(squares: list[int], white_to_move: bool) -> int:
+    # mirror the board so the white king is on files a to d
+    if squares[0] & 7 >= 4:
+        squares = [square ^ 7 for square in squares]
+
+    index = (squares[0] >> 3) * 4 + (squares[0] & 7)
+    for square in squares[1:]:
+        index = index * 64 + square
+
+    return index * 2 + (0 if white_to_move else 1)
+
+
+def decode(index: int, count: int) -> tuple[list[int], bool]:
+    index, side = divmod(index, 2)
+
+    squares = []
+    for _ in range(count - 1):
+        index, square = divmod(index, 64)
+        squares.append(square)
+
+    # convert the white king back from the left half of the board
+    squares.append((index // 4) * 8 + index % 4)
+    squares.reverse()
+
+    return squares, side == 0
+
+
+def position_key(board: Board | BitBoard) -> tuple[str, list[int], bool]:
+    white, black = [], []
+    for rank, row in enumerate(board.board):
+        for file, piece in enumerate(row):
+            if piece.isupper():
+                white.append((PIECE_ORDER.index(piece), rank * 8 + file))
+            elif piece:
+                black.append((PIECE_ORDER.index(piece.upper()), rank * 8 + file))
+
+    white_to_move = board.white_to_move
+
+    # swap the colours and flip the board if black is the stronger side
+    white.sort()
+    black.sort()
+    names = [
+        "".join(PIECE_ORDER[piece] for piece, _ in side) for side in (white, black)
+    ]
+    if is_flipped(*names):
+        white, black = (
+            [(piece, square ^ 56) for piece, square in black],
+            [(piece, square ^ 56) for piece, square in white],
+        )
+        names.reverse()
+        white_to_move = not white_to_move
+
+    squares = [square for _, square in white + black]
+    return "".join(names), squares, white_to_move
+
+
+class Tablebases:
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        self.tables = {}
+
+        # positions with more pieces than the largest table are never probed
+        names = [file[:-3] for file in os.listdir(directory) if file.endswith(".tb")]
+        self.max_pieces = max((len(name) for name in names), default=0)
+
+    def count_pieces(self, board: Board | BitBoard) -> int:
+        return sum(1 for row in board.board for piece in row if piece)
+
+    def load(self, name: str) -> mmap.mmap | None:
+        # tables are mapped the first time they're needed
+        if name not in self.tables:
+            path = os.path.join(self.directory, f"{name}.tb")
+            table = None
+            if os.path.exists(path):
+                with open(path, "rb") as file:
+                    table = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                if table[: len(MAGIC)] != MAGIC:
+                    raise ValueError(f"Invalid tablebase file: {path}")
+            self.tables[name] = table
+
+        return self.tables[name]
+
+    def probe(self, board: Board | BitBoard) -> tuple[int, int] | None:
+        # returns 1, 0 or -1 for a win, draw or loss for the side to move
+        # and the number of plies until mate, or None if the endgame isn't stored
+        name, squares, white_to_move = position_key(board)
+        if len(squares) > self.max_pieces:
+            return None
+        if is_drawn(*split_name(name)):
+            return 0, 0
+
+        table = self.load(name)
+        if table is None:
+            return None
+
+        # the value is the plies until mate plus one, an odd number of plies is a win
+        value = table[len(MAGIC) + encode(squares, white_to_move)]
+        if value == 0:
+            return 0, 0
+
+        plies = value - 1
+        return (1 if plies % 2 else -1), plies
+
+    def close(self) -> None:
+        for table in self.tables.values():
+            if table is not None:
+                table.close()
+        self.tables = {}
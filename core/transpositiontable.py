@@ -0,0 +1,63 @@
+from core.move import Move
+
+# the types of bound the stored score represents
+EXACT = 0
+LOWER = 1
+UPPER = 2
+
+# the approximate memory used by a single entry in bytes
+ENTRY_SIZE = 256
+
+
+class TranspositionTable:
+    def __init__(self, size_mb: int = 16, replacement: str = "depth") -> None:
+        if replacement not in ("depth", "always"):
+            raise ValueError(f"Unknown replacement policy: {replacement}")
+
+        self.replacement = replacement
+        self.resize(size_mb)
+
+    def resize(self, size_mb: int) -> None:
+        # the table is allocated once so memory stays flat while searching
+        self.size = max(1, size_mb * 1024 * 1024 // ENTRY_SIZE)
+        self.entries = [None] * self.size
+        self.age = 0
+
+    def clear(self) -> None:
+        self.entries = [None] * self.size
+        self.age = 0
+
+    def new_search(self) -> None:
+        # entries from older searches are always replaced
+        self.age += 1
+
+    def probe(self, hash: int) -> tuple[int, int, int, Move | None] | None:
+        entry = self.entries[hash % self.size]
+
+        # return the depth, flag, score and move if the position matches
+        if entry is not None and entry[0] == hash:
+            return entry[1:5]
+
+        return None
+
+    def store(
+        self, hash: int, depth: int, flag: int, score: int, move: Move | None
+    ) -> None:
+        index = hash % self.size
+        entry = self.entries[index]
+
+        # only replace a deeper entry from the current search if it's a different position
+        if self.replacement == "depth" and entry is not None:
+            if entry[5] == self.age and entry[1] > depth and entry[0] != hash:
+                return
+
+        # keep the old best move if one wasn't found for the same position
+        if move is None and entry is not None and entry[0] == hash:
+            move = entry[4]
+
+        self.entries[index] = (hash, depth, flag, score, move, self.age)
+
+    def usage(self) -> float:
+        # the fraction of the first thousand slots that are filled
+        sample = self.entries[:1000]
+        return sum(entry is not None for entry in sample) / len(sample)
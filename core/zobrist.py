@@ -0,0 +1,31 @@
+# the keys are 64 bits
+MASK = (1 << 64) - 1
+
+
+def splitmix64(seed: int):
+    # a small random number generator, importing random takes longer than making the keys
+    while True:
+        seed = (seed + 0x9E3779B97F4A7C15) & MASK
+        key = seed
+        key = ((key ^ (key >> 30)) * 0xBF58476D1CE4E5B9) & MASK
+        key = ((key ^ (key >> 27)) * 0x94D049BB133111EB) & MASK
+        yield key ^ (key >> 31)
+
+
+# use a fixed seed so the keys, and therefore hashes, are the same every run
+generator = splitmix64(810)
+
+# a random key for every piece on every square
+PIECE_KEYS = {
+    piece: [[next(generator) for file in range(8)] for rank in range(8)]
+    for piece in "PNBRQKpnbrqk"
+}
+
+# a key for when it is black to move
+SIDE_KEY = next(generator)
+
+# a key for each of the castle rights
+CASTLE_KEYS = {castle: next(generator) for castle in "KQkq"}
+
+# a key for the file of an en passant square that can be captured on
+EN_PASSANT_KEYS = [next(generator) for file in range(8)]
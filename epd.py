@@ -0,0 +1,163 @@
+import argparse
+import multiprocessing
+import time
+from core.backends import BACKENDS
+from core.engine import Engine
+from core.instrument import Profiler
+from core.san import parse_san, to_san
+
+
+def parse_epd(line: str) -> tuple[str, dict[str, list[str]]]:
+    # the position is the first four fields, followed by operations such as bm Qg6;
+    fields = line.split(maxsplit=4)
+    fen = " ".join(fields[:4])
+
+    operations = {}
+    for operation in (fields[4] if len(fields) > 4 else "").split(";"):
+        opcode, _, operands = operation.strip().partition(" ")
+        if opcode:
+            operations[opcode] = operands.replace('"', "").split()
+
+    # the move counters can be given as operations instead of fields
+    halfmove_clock = operations.get("hmvc", ["0"])[0]
+    fullmove_number = operations.get("fmvn", ["1"])[0]
+
+    return f"{fen} {halfmove_clock} {fullmove_number}", operations
+
+
+def read_epd(path: str):
+    # yield the number, fen and operations of each position in the file
+    with open(path) as file:
+        number = 0
+        for line in file:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+
+            number += 1
+            yield number, *parse_epd(line)
+
+
+def run_position(
+    number: int,
+    fen: str,
+    operations: dict[str, list[str]],
+    move_time: float,
+    depth: int,
+    hash_size: int,
+    backend: str,
+) -> dict:
+    board = BACKENDS[backend].from_fen(fen)
+    engine = Engine(hash_size, verbose=False)
+
+    # the best moves to find and the moves to avoid, written in SAN
+    best_moves = [parse_san(board, san) for san in operations.get("bm", [])]
+    avoid_moves = [parse_san(board, san) for san in operations.get("am", [])]
+
+    start_time = time.perf_counter()
+    move = engine.search(board, move_time, depth)
+    elapsed = time.perf_counter() - start_time
+
+    solved = move is not None
+    if best_moves:
+        solved = solved and move in best_moves
+    if avoid_moves:
+        solved = solved and move not in avoid_moves
+
+    moves = board.get_legal_moves()
+    engine.close()
+
+    return {
+        "number": number,
+        "id": " ".join(operations.get("id", [])) or str(number),
+        "move": to_san(board, move, moves) if move is not None else None,
+        "expected": operations.get("bm", []),
+        "avoid": operations.get("am", []),
+        "solved": solved,
+        "nodes": engine.nodes,
+        "time": elapsed,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Run the engine on each position of an EPD test suite."
+    )
+    parser.add_argument("path", nargs="?", default="positions/wac.epd")
+    parser.add_argument("--time", type=float, help="seconds per position")
+    parser.add_argument("--depth", type=int, help="depth per position")
+    parser.add_argument("--hash", type=int, default=16, help="megabytes per engine")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--backend", choices=BACKENDS, default="list")
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="profile.folded",
+        help="time each phase and write a flame graph to this file",
+    )
+    args = parser.parse_args()
+
+    # a fixed depth has no time limit unless one is given as well
+    move_time = args.time
+    if move_time is None:
+        move_time = float("inf") if args.depth else 1.0
+    depth = args.depth or 64
+
+    jobs = (
+        (number, fen, operations, move_time, depth, args.hash, args.backend)
+        for number, fen, operations in read_epd(args.path)
+    )
+
+    results = []
+    start_time = time.perf_counter()
+
+    # the profiler only sees this process, so the positions are run here instead
+    profiler = Profiler() if args.profile else None
+    if profiler:
+        profiler.start()
+        for result in map(run_job, jobs):
+            results.append(result)
+            print_result(result)
+
+        profiler.stop()
+
+    # print each result in order as soon as it is ready
+    else:
+        with multiprocessing.Pool(args.workers) as pool:
+            for result in pool.imap(run_job, jobs):
+                results.append(result)
+                print_result(result)
+
+    elapsed = time.perf_counter() - start_time
+    solved = sum(result["solved"] for result in results)
+    nodes = sum(result["nodes"] for result in results)
+    search_time = sum(result["time"] for result in results)
+
+    print(f"\nSolved: {solved}/{len(results)}")
+    print(f"Nodes: {nodes}")
+    print(f"Nodes per Second: {round(nodes / max(search_time, 1e-9))}")
+    print(f"Time: {round(elapsed, 2)}s")
+
+    if profiler:
+        print(f"\n{profiler.report()}")
+        profiler.write_flamegraph(args.profile)
+
+
+def print_result(result: dict) -> None:
+    status = "solved" if result["solved"] else "failed"
+    expected = " ".join(result["expected"])
+    if result["avoid"]:
+        expected += " not " + " ".join(result["avoid"])
+    print(
+        f"{result['id']}: {result['move']} ({expected.strip()}), {status}, "
+        f"{result['nodes']} nodes, {round(result['time'], 2)}s"
+    )
+
+
+def run_job(job: tuple) -> dict:
+    # the pool passes one argument to each job
+    return run_position(*job)
+
+
+if __name__ == "__main__":
+    main()
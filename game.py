@@ -1,6 +1,12 @@
+import threading
+from functools import lru_cache
 import pygame
-from objects.engine import Engine
-from objects.board import Board
+from core.engine import Engine
+from core.board import Board
+from core.move import Move
+from core.bitboard import BitBoard
+from core.backends import BACKENDS
+from core.rules import game_result, DRAW, WHITE_WIN
 from objects.drawnobject import DrawnObject
 from constants import (
     BLUE,
@@ -11,25 +17,85 @@ from constants import (
     DARK_YELLOW,
     BLACK,
     GREEN,
-    CHESS_POSITION,
 )
+from core.constants import CHESS_POSITION
+
+# the image file of each piece, where the key is the char stored in the board
+PIECE_IMAGES = {
+    "P": "assets/white-pawn.png",
+    "N": "assets/white-knight.png",
+    "B": "assets/white-bishop.png",
+    "R": "assets/white-rook.png",
+    "Q": "assets/white-queen.png",
+    "K": "assets/white-king.png",
+    "p": "assets/black-pawn.png",
+    "n": "assets/black-knight.png",
+    "b": "assets/black-bishop.png",
+    "r": "assets/black-rook.png",
+    "q": "assets/black-queen.png",
+    "k": "assets/black-king.png",
+}
+
+
+@lru_cache(maxsize=None)
+def load_images() -> dict[str, pygame.Surface]:
+    # the images are only read from disk and decoded once
+    return {piece: pygame.image.load(path) for piece, path in PIECE_IMAGES.items()}
+
+
+@lru_cache(maxsize=4)
+def scale_images(size: int) -> dict[str, pygame.Surface]:
+    # keep the last few sizes so resizing back and forth doesn't scale them again
+    # converting to the display's format makes drawing them faster
+    return {
+        piece: pygame.transform.scale(image, (size, size)).convert_alpha()
+        for piece, image in load_images().items()
+    }
 
 
 class Game(DrawnObject):
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        backend: str = "list",
+        workers: int = 1,
+        book: str | None = None,
+        tablebases: str | None = None,
+    ) -> None:
         super().__init__()
-        self.load_images()
 
         self.is_over = False
         self.player_is_white = True
         self.held_piece = None
 
-        self.engine = Engine()
-        self.board = Board(CHESS_POSITION, True)
+        self.engine = Engine(workers=workers, book=book, tablebases=tablebases)
+
+        # fork the workers on the main thread, a fork from a search thread can deadlock
+        if workers > 1:
+            self.engine.start_workers()
+
+        self.search_thread = None
+        self.computer_move = None
+        self.ponder_move = None
+        self.board = BACKENDS[backend]([rank.copy() for rank in CHESS_POSITION], True)
         self.next_moves = self.board.get_legal_moves()
 
+        # the rendered board and pieces, and where the held piece was last drawn
+        self.layer = None
+        self.layer_state = None
+        self.held_rect = None
+
+        self.update()
+
     def update(self) -> None:
         self.load_images()
+        self.render_board()
+
+        # the sizes changed, so the whole screen is drawn again
+        self.layer_state = None
+
+    @property
+    def thinking(self) -> bool:
+        return self.search_thread is not None and self.ponder_move is None
 
     @property
     def player_to_move(self) -> bool:
@@ -80,30 +146,109 @@ class Game(DrawnObject):
         # flip rank and file if playing as black
         rank, file = self.flip_coordinates(rank, file)
 
-        # if the move is a valid move
+        # if the move is a valid move, promotions are to a queen since it is first
         for move in self.next_moves:
             if move.old_pos == self.held_piece:
                 if (rank, file) == move.new_pos:
                     self.board = self.board.make_move(move)
+                    self.stop_pondering(move)
+                    self.check_result()
+                    break
         self.held_piece = None
 
-    def make_computer_move(self) -> None:
-        move = self.engine.search(self.board)
-        if move:
-            self.board = self.board.make_move(move)
-            self.next_moves = self.board.get_legal_moves()
+    def search(self, board: Board | BitBoard, ponder: bool = False) -> None:
+        self.computer_move = self.engine.search(board, ponder=ponder)
 
-            if len(self.next_moves) == 0:
-                self.is_over = True
-                self.winner = "Computer"
+    def start_pondering(self) -> None:
+        # search the reply the engine expects while the player thinks
+        self.ponder_move = self.engine.ponder_move
+        if self.ponder_move not in self.next_moves:
+            self.ponder_move = None
+            return
+
+        self.search_thread = threading.Thread(
+            target=self.search,
+            args=(self.board.make_move(self.ponder_move), True),
+            daemon=True,
+        )
+        self.search_thread.start()
+
+    def stop_pondering(self, move: Move) -> None:
+        if self.ponder_move is None:
+            return
 
+        # the expected move keeps the search going, otherwise only the tables are kept
+        if move == self.ponder_move:
+            self.engine.ponder_hit()
         else:
-            self.is_over = True
+            self.join_search()
+
+        self.ponder_move = None
+
+    def join_search(self) -> None:
+        # keep stopping until the thread ends, the search resets the flag when it starts
+        while self.search_thread.is_alive():
+            self.engine.stop()
+            self.search_thread.join(0.01)
+
+        self.search_thread = None
+
+    def stop_search(self) -> None:
+        # stop the engine and wait for the thread to finish
+        if self.search_thread is not None:
+            self.join_search()
+
+        self.engine.close()
+
+    def make_computer_move(self) -> None:
+        # search on a copy in the background so the window keeps responding
+        if self.search_thread is None:
+            self.search_thread = threading.Thread(
+                target=self.search, args=(self.board.copy(),), daemon=True
+            )
+            self.search_thread.start()
+            return
+
+        # wait until the search is finished
+        if self.search_thread.is_alive():
+            return
+
+        self.search_thread = None
+        if self.computer_move:
+            self.board = self.board.make_move(self.computer_move)
+
+        self.check_result()
+        if not self.is_over:
+            self.start_pondering()
+
+    def check_result(self) -> None:
+        self.next_moves = self.board.get_legal_moves()
+        result = game_result(self.board, self.next_moves)
+        if result is None:
+            return
+
+        self.is_over = True
+        outcome, self.reason = result
+
+        # the winner is None for a draw
+        if outcome == DRAW:
+            self.winner = None
+        elif (outcome == WHITE_WIN) == self.player_is_white:
             self.winner = "Player"
+        else:
+            self.winner = "Computer"
+
+    def draw_thinking(self, screen: pygame.surface.Surface) -> None:
+        font = pygame.font.SysFont("arial", self.padd // 2, True)
+
+        # draw the text above the board
+        font_surf = font.render("Thinking...", True, BLACK)
+        height = font.size("Thinking...")[1]
+        screen.blit(font_surf, (self.x_padd, self.y_padd - height - self.line_size))
 
     def draw_winner(self, screen: pygame.surface.Surface) -> None:
         font = pygame.font.SysFont("arial", self.square_size, True)
-        text = f"{self.winner} Won!"
+        text = f"{self.winner} Won!" if self.winner else "Draw!"
 
         # get the width and height, and draw the text to a surface
         width, height = font.size(text)
@@ -118,26 +263,52 @@ class Game(DrawnObject):
             ),
         )
 
-    def draw(self, screen: pygame.surface.Surface) -> None:
-        screen.fill(BLUE)
-
-        # draw the checkerboard
+    def render_board(self) -> None:
+        # the checkerboard only changes size, so it's drawn once for each size
+        self.board_surface = pygame.Surface((self.board_size, self.board_size))
         for rank in range(8):
             for file in range(8):
                 # determine colour of square based on if the sum of the rank and file is even or odd
                 colour = WHITE if (rank + file) % 2 == 0 else DARK_BLUE
+                pygame.draw.rect(
+                    self.board_surface,
+                    colour,
+                    (
+                        self.square_size * file,
+                        self.square_size * rank,
+                        self.square_size,
+                        self.square_size,
+                    ),
+                )
 
-                # highlight squares part of the last move
-                last_move = self.board.last_move
-                if last_move:
-                    if (rank, file) == last_move.old_pos:
-                        colour = DARK_YELLOW
-                    elif (rank, file) == last_move.new_pos:
-                        colour = YELLOW
-
-                # draw the square
+        # a dot on empty squares the held piece can move to
+        radius = self.square_size // 6
+        self.dot = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+        pygame.draw.circle(self.dot, PINK, (radius, radius), radius)
+
+        # a circle outline on pieces it can capture
+        radius = round(self.square_size / 2.5)
+        self.ring = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+        pygame.draw.circle(self.ring, PINK, (radius, radius), radius, self.line_size)
+
+    def draw_layer(self, size: tuple[int, int]) -> None:
+        # draw everything except the held piece, which moves with the mouse
+        if self.layer is None or self.layer.get_size() != size:
+            self.layer = pygame.Surface(size)
+        layer = self.layer
+
+        layer.fill(BLUE)
+        layer.blit(self.board_surface, (self.x_padd, self.y_padd))
+
+        # highlight squares part of the last move
+        last_move = self.board.last_move
+        if last_move:
+            for (rank, file), colour in (
+                (last_move.old_pos, DARK_YELLOW),
+                (last_move.new_pos, YELLOW),
+            ):
                 pygame.draw.rect(
-                    screen,
+                    layer,
                     colour,
                     (
                         self.get_x(file),
@@ -152,79 +323,83 @@ class Game(DrawnObject):
             move.new_pos for move in self.next_moves if move.old_pos == self.held_piece
         ]
 
+        board = self.board.board
         for rank in range(8):
             for file in range(8):
-                piece = self.board.board[rank][file]
+                piece = board[rank][file]
 
                 # draw the piece
                 if piece and (rank, file) != self.held_piece:
-                    screen.blit(
-                        self.images[piece], (self.get_x(file), self.get_y(rank))
-                    )
+                    layer.blit(self.images[piece], (self.get_x(file), self.get_y(rank)))
 
                 # draw a circle if the held piece can move to that square
                 if (rank, file) in attack_moves:
-                    # determine the radius and width based on if its attacking a piece
-                    if piece:
-                        # circle outline on piece
-                        radius = round(self.square_size / 2.5)
-                        width = self.line_size
-                    else:
-                        # dot on square
-                        radius = self.square_size // 6
-                        width = 0
-
-                    # create a surface and draw the circle on it
-                    surface = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
-                    pygame.draw.circle(surface, PINK, (radius, radius), radius, width)
-
-                    # draw the surface onto the screen
-                    x = self.get_x(file) + 0.5 * self.square_size - radius
-                    y = self.get_y(rank) + 0.5 * self.square_size - radius
-                    screen.blit(surface, (x, y))
-
-        # if holding a piece
-        if self.held_piece is not None:
-            rank, file = self.held_piece
-            piece = self.board.board[rank][file]
-            mouse_x, mouse_y = pygame.mouse.get_pos()
-
-            # draw the held piece adjusted for mouse offset
-            screen.blit(
-                self.images[piece], (mouse_x - self.x_offset, mouse_y - self.y_offset)
-            )
+                    surface = self.ring if piece else self.dot
+                    offset = (self.square_size - surface.get_width()) // 2
+                    layer.blit(
+                        surface, (self.get_x(file) + offset, self.get_y(rank) + offset)
+                    )
 
         # draw board outline
         pygame.draw.rect(
-            screen,
+            layer,
             BLACK,
             (self.x_padd, self.y_padd, self.board_size, self.board_size),
             3,
         )
 
+        # show that the computer is searching
+        if self.thinking and not self.is_over:
+            self.draw_thinking(layer)
+
         # draw the winner and if game over
         if self.is_over:
-            return self.draw_winner(screen)
+            self.draw_winner(layer)
+
+    def draw(self, screen: pygame.surface.Surface) -> list[pygame.Rect]:
+        # returns the areas of the screen that changed
+        rects = []
+
+        # draw the board again only when something on it has changed
+        state = (
+            self.board,
+            self.held_piece,
+            self.thinking,
+            self.is_over,
+            screen.get_size(),
+        )
+        if state != self.layer_state:
+            self.draw_layer(screen.get_size())
+            screen.blit(self.layer, (0, 0))
+            self.layer_state = state
+            self.held_rect = None
+            rects.append(screen.get_rect())
 
-    def load_images(self) -> None:
-        # load each piece where the key is the char stored in the board
-        self.images = {
-            "P": pygame.image.load("assets/white-pawn.png"),
-            "N": pygame.image.load("assets/white-knight.png"),
-            "B": pygame.image.load("assets/white-bishop.png"),
-            "R": pygame.image.load("assets/white-rook.png"),
-            "Q": pygame.image.load("assets/white-queen.png"),
-            "K": pygame.image.load("assets/white-king.png"),
-            "p": pygame.image.load("assets/black-pawn.png"),
-            "n": pygame.image.load("assets/black-knight.png"),
-            "b": pygame.image.load("assets/black-bishop.png"),
-            "r": pygame.image.load("assets/black-rook.png"),
-            "q": pygame.image.load("assets/black-queen.png"),
-            "k": pygame.image.load("assets/black-king.png"),
-        }
-
-        # resize the image to square_size
-        for image in self.images:
-            self.images[image] = pygame.transform.scale(
-                self.images[image], (self.square_size, self.square_size)
+        # if holding a piece
+        if self.held_piece is not None:
+            rank, file = self.held_piece
+            mouse_x, mouse_y = pygame.mouse.get_pos()
+
+            # the held piece adjusted for mouse offset
+            rect = pygame.Rect(
+                mouse_x - self.x_offset,
+                mouse_y - self.y_offset,
+                self.square_size,
+                self.square_size,
             )
+
+            # cover where it was with the board, then draw it where it is now
+            if rect != self.held_rect:
+                if self.held_rect is not None:
+                    screen.blit(self.layer, self.held_rect, self.held_rect)
+                    rects.append(self.held_rect)
+
+                screen.blit(self.images[self.board.board[rank][file]], rect)
+                rects.append(rect)
+                self.held_rect = rect
+
+        return rects
+
+    def load_images(self) -> None:
+        # resize the images to square_size
+        self.images = scale_images(self.square_size)
@@ -1,27 +1,51 @@
+import argparse
 import pygame
 from game import Game
 from objects.drawnobject import DrawnObject
-from constants import SCREEN_WIDTH, SCREEN_HEIGHT, MIN_WIDTH, MIN_HEIGHT
+from core.backends import BACKENDS
+from constants import (
+    SCREEN_WIDTH,
+    SCREEN_HEIGHT,
+    MIN_WIDTH,
+    MIN_HEIGHT,
+    MAX_FPS,
+    SEARCH_POLL_MS,
+)
 
-# pygame setup
-pygame.init()
 
-# change the title and icon of the window
-pygame.display.set_caption("Chess")
-pygame.display.set_icon(pygame.image.load("assets/black-queen.png"))
+def main() -> None:
+    # choose the board representation
+    parser = argparse.ArgumentParser(description="Play Chess against the computer.")
+    parser.add_argument("--backend", choices=BACKENDS, default="list")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--book", help="an opening book made by makebook.py")
+    parser.add_argument("--tablebases", help="a folder made by maketables.py")
+    args = parser.parse_args()
 
+    # pygame setup, done here so importing this module doesn't open a display
+    pygame.init()
+
+    # change the title and icon of the window
+    pygame.display.set_caption("Chess")
+    pygame.display.set_icon(pygame.image.load("assets/black-queen.png"))
 
-def main() -> None:
     # setup game
     DrawnObject.set_sizes(SCREEN_WIDTH, SCREEN_HEIGHT)
     screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.RESIZABLE)
-    game = Game()
+    game = Game(args.backend, args.workers, args.book, args.tablebases)
+    clock = pygame.time.Clock()
 
     # main loop
     while True:
-        for event in pygame.event.get():
+        # sleep until something happens, but keep checking on the computer's search
+        computer_to_move = not game.is_over and not game.player_to_move
+        events = [pygame.event.wait(SEARCH_POLL_MS if computer_to_move else 0)]
+        events += pygame.event.get()
+
+        for event in events:
             # if the user hits the x button quit the application
             if event.type == pygame.QUIT:
+                game.stop_search()
                 pygame.quit()
                 return
 
@@ -34,22 +58,28 @@ def main() -> None:
                 screen = pygame.display.set_mode((width, height), pygame.RESIZABLE)
                 DrawnObject.set_sizes(width, height)
 
-            if not game.is_over:
-                if game.player_to_move:
-                    # if the players clicks down the mouse, grab the piece
-                    if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                        game.grab_piece(*event.pos)
+            # the window was uncovered, so show the last frame again
+            if event.type == pygame.VIDEOEXPOSE:
+                pygame.display.flip()
+
+            if not game.is_over and game.player_to_move:
+                # if the players clicks down the mouse, grab the piece
+                if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                    game.grab_piece(*event.pos)
+
+                # if the player releases the mouse, drop the piece
+                if event.type == pygame.MOUSEBUTTONUP and event.button == 1:
+                    game.drop_piece(*event.pos)
 
-                    # if the player releases the mouse, drop the piece
-                    if event.type == pygame.MOUSEBUTTONUP and event.button == 1:
-                        game.drop_piece(*event.pos)
+        # start or check on the computer's search, which runs in the background
+        if not game.is_over and not game.player_to_move:
+            game.make_computer_move()
 
-                else:
-                    game.make_computer_move()
+        # draw what changed and update only those parts of the screen
+        pygame.display.update(game.draw(screen))
 
-        # draw everything to the screen
-        game.draw(screen)
-        pygame.display.flip()
+        # limit the frame rate, such as while dragging a piece
+        clock.tick(MAX_FPS)
 
 
 # run the program
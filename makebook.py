@@ -0,0 +1,138 @@
+import argparse
+import json
+import re
+from core.board import Board
+from core.book import encode_move, write_book
+from core.fen import START_FEN
+from core.san import parse_san
+
+# the points a move gets from the result, for the side that played it
+POINTS = {"win": 2, "draw": 1, "loss": 0}
+
+# comments, variations, annotations and move numbers aren't needed to replay a game
+NOISE = re.compile(r"\{[^}]*\}|;[^\n]*|\$\d+|\d+\.+")
+RESULTS = ("1-0", "0-1", "1/2-1/2", "*")
+
+
+def remove_variations(text: str) -> str:
+    # variations can be nested, so keep only text outside of brackets
+    depth = 0
+    kept = []
+    for char in text:
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth = max(depth - 1, 0)
+        elif depth == 0:
+            kept.append(char)
+
+    return "".join(kept)
+
+
+def read_pgn(path: str):
+    # yield the fen, the moves and the result of each game in the file
+    tags = {}
+    movetext = []
+
+    def finish():
+        text = remove_variations(NOISE.sub(" ", " ".join(movetext)))
+        tokens = text.split()
+        result = tags.get("Result", "*")
+        moves = [token for token in tokens if token not in RESULTS]
+        return tags.get("FEN", START_FEN), moves, result
+
+    with open(path, encoding="utf-8", errors="replace") as file:
+        for line in file:
+            line = line.strip()
+            if line.startswith("["):
+                # a tag after moves starts the next game
+                if movetext:
+                    yield finish()
+                    tags, movetext = {}, []
+
+                match = re.match(r'\[(\w+)\s+"(.*)"\]', line)
+                if match:
+                    tags[match.group(1)] = match.group(2)
+            elif line:
+                movetext.append(line)
+
+    if movetext:
+        yield finish()
+
+
+def read_log(path: str):
+    # yield the fen, the moves and the result of each game in a tournament log
+    with open(path) as file:
+        for line in file:
+            if line.strip():
+                game = json.loads(line)
+                yield game["fen"], game["moves"], game["result"]
+
+
+def add_game(
+    weights: dict[tuple[int, int], int],
+    fen: str,
+    moves: list[str],
+    result: str,
+    plies: int,
+    san: bool,
+) -> bool:
+    board = Board.from_fen(fen)
+
+    for notation in moves[:plies]:
+        if san:
+            move = parse_san(board, notation)
+        else:
+            move = next(
+                (move for move in board.get_legal_moves() if move.to_uci() == notation),
+                None,
+            )
+
+        # stop at the first move that can't be read
+        if move is None:
+            return False
+
+        # score the move for the side that played it
+        if result == "1/2-1/2":
+            points = POINTS["draw"]
+        elif result in ("1-0", "0-1"):
+            won = (result == "1-0") == board.white_to_move
+            points = POINTS["win" if won else "loss"]
+        else:
+            points = POINTS["draw"]
+
+        key = (board.hash, encode_move(move))
+        weights[key] = weights.get(key, 0) + points
+        board.push(move)
+
+    return True
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Build an opening book from PGN files or tournament logs."
+    )
+    parser.add_argument("--pgn", nargs="*", default=[], help="PGN files of games")
+    parser.add_argument("--log", nargs="*", default=[], help="logs from tournament.py")
+    parser.add_argument("--plies", type=int, default=16, help="moves per game to add")
+    parser.add_argument("--output", default="book.bin")
+    args = parser.parse_args()
+
+    weights = {}
+    games = 0
+    errors = 0
+
+    sources = [(read_pgn(path), True) for path in args.pgn]
+    sources += [(read_log(path), False) for path in args.log]
+    for games_in_file, san in sources:
+        for fen, moves, result in games_in_file:
+            games += 1
+            if not add_game(weights, fen, moves, result, args.plies, san):
+                errors += 1
+
+    entries = write_book(args.output, weights)
+    print(f"Games: {games}, Unreadable Games: {errors}, Entries: {entries}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+import argparse
+import os
+import time
+from array import array
+from core.bitboard import BitBoard
+from core.tablebase import (
+    MAGIC,
+    Tablebases,
+    split_name,
+    sort_pieces,
+    is_flipped,
+    is_drawn,
+    table_size,
+    encode,
+    decode,
+)
+
+# the endgames made when none are given
+DEFAULT_ENDGAMES = ["KQK", "KRK", "KPK"]
+
+# the most plies until mate a byte can hold
+MAX_PLIES = 254
+
+
+def canonical_name(white: str, black: str) -> str:
+    white, black = sort_pieces(white), sort_pieces(black)
+    if is_flipped(white, black):
+        white, black = black, white
+    return white + black
+
+
+def dependencies(name: str) -> set[str]:
+    # the endgames reached by a capture or a promotion
+    white, black = split_name(name)
+    names = set()
+
+    for side, other in ((white, black), (black, white)):
+        for index, piece in enumerate(side):
+            if piece == "K":
+                continue
+
+            # the piece is captured
+            names.add(canonical_name(side[:index] + side[index + 1 :], other))
+
+            # the pawn promotes, and may capture the other side's piece at the same time
+            if piece == "P":
+                for promotion in "QRBN":
+                    promoted = side[:index] + promotion + side[index + 1 :]
+                    names.add(canonical_name(promoted, other))
+                    for captured in range(1, len(other)):
+                        rest = other[:captured] + other[captured + 1 :]
+                        names.add(canonical_name(promoted, rest))
+
+    return {name for name in names if not is_drawn(*split_name(name))}
+
+
+def setup_board(pieces: list[str], squares: list[int], white_to_move: bool) -> BitBoard:
+    rows = [[""] * 8 for _ in range(8)]
+    for piece, square in zip(pieces, squares):
+        rows[square >> 3][square & 7] = piece
+
+    # endgames have no castling
+    board = BitBoard(rows, True)
+    board.white_to_move = white_to_move
+    board.w_castle_k = board.w_castle_q = False
+    board.b_castle_k = board.b_castle_q = False
+    board.hash = board.compute_hash()
+
+    return board
+
+
+def is_valid(pieces: list[str], squares: list[int], board: BitBoard) -> bool:
+    # every piece on its own square, and no pawns on the first or last rank
+    if len(set(squares)) != len(squares):
+        return False
+    for piece, square in zip(pieces, squares):
+        if piece in "Pp" and (square < 8 or square >= 56):
+            return False
+
+    # the side that just moved can't be left in check
+    board.white_to_move = not board.white_to_move
+    in_check = board.in_check()
+    board.white_to_move = not board.white_to_move
+
+    return not in_check
+
+
+def generate(name: str, directory: str, tablebases: Tablebases) -> None:
+    white, black = split_name(name)
+    pieces = list(white) + [piece.lower() for piece in black]
+    count = len(pieces)
+    size = table_size(count)
+
+    start_time = time.perf_counter()
+
+    # the result of each position as plies until mate plus one, zero is a draw
+    values = bytearray(size)
+    done = bytearray(size)
+
+    # the positions reached by quiet moves, stored one after another per position
+    offsets = array("I", [0]) * (size + 1)
+    successors = array("I")
+
+    # the best result from captures and promotions, from the side to move's view
+    exit_win = array("H", [0]) * size
+    exit_loss = array("H", [0]) * size
+    exit_draw = bytearray(size)
+
+    buckets = [[] for _ in range(MAX_PLIES + 2)]
+
+    for index in range(size):
+        offsets[index] = len(successors)
+        squares, white_to_move = decode(index, count)
+        if len(set(squares)) != count:
+            done[index] = 1
+            continue
+
+        board = setup_board(pieces, squares, white_to_move)
+        if not is_valid(pieces, squares, board):
+            done[index] = 1
+            continue
+
+        moves = board.get_legal_moves()
+
+        # checkmate is a loss in 0 plies, stalemate is a draw
+        if not moves:
+            if board.in_check():
+                buckets[0].append(index)
+            else:
+                done[index] = 1
+            continue
+
+        for move in moves:
+            old_square = move.old_rank * 8 + move.old_file
+            new_square = move.new_rank * 8 + move.new_file
+
+            # captures and promotions leave this endgame, so look them up
+            if move.captured or move.promotion:
+                board.push(move)
+                result = tablebases.probe(board)
+                board.pop()
+
+                wdl, plies = result if result is not None else (0, 0)
+                if wdl < 0:
+                    best = exit_win[index]
+                    exit_win[index] = plies + 1 if not best else min(best, plies + 1)
+                elif wdl > 0:
+                    exit_loss[index] = max(exit_loss[index], plies + 1)
+                else:
+                    exit_draw[index] = 1
+                continue
+
+            # a quiet move moves one piece
+            new_squares = squares.copy()
+            new_squares[squares.index(old_square)] = new_square
+            successors.append(encode(new_squares, not white_to_move))
+
+        if exit_win[index]:
+            buckets[min(exit_win[index], MAX_PLIES)].append(index)
+
+    offsets[size] = len(successors)
+
+    # invert the quiet moves to find the positions that lead to each position
+    remaining = array("H", [0]) * size
+    predecessor_offsets = array("I", [0]) * (size + 1)
+    for index in range(size):
+        remaining[index] = offsets[index + 1] - offsets[index]
+        for successor in successors[offsets[index] : offsets[index + 1]]:
+            predecessor_offsets[successor + 1] += 1
+    for index in range(size):
+        predecessor_offsets[index + 1] += predecessor_offsets[index]
+
+    predecessors = array("I", [0]) * len(successors)
+    filled = array("I", predecessor_offsets[:size])
+    for index in range(size):
+        for successor in successors[offsets[index] : offsets[index + 1]]:
+            predecessors[filled[successor]] = index
+            filled[successor] += 1
+    del successors, filled
+
+    # positions where every move leaves the endgame and loses
+    for index in range(size):
+        if not done[index] and not remaining[index] and exit_loss[index]:
+            if not exit_win[index] and not exit_draw[index]:
+                buckets[min(exit_loss[index], MAX_PLIES)].append(index)
+
+    # go through positions in order of plies until mate, so each is found at its shortest
+    for plies in range(MAX_PLIES + 1):
+        for index in buckets[plies]:
+            if done[index]:
+                continue
+            done[index] = 1
+            values[index] = plies + 1
+
+            start, end = predecessor_offsets[index], predecessor_offsets[index + 1]
+            for predecessor in predecessors[start:end]:
+                if done[predecessor]:
+                    continue
+
+                # a move to a lost position wins
+                if plies % 2 == 0:
+                    buckets[min(plies + 1, MAX_PLIES)].append(predecessor)
+                    continue
+
+                # the position is lost once every move leads to a win for the opponent
+                remaining[predecessor] -= 1
+                if remaining[predecessor] == 0:
+                    if exit_win[predecessor] or exit_draw[predecessor]:
+                        continue
+                    loss = max(plies + 1, exit_loss[predecessor])
+                    buckets[min(loss, MAX_PLIES)].append(predecessor)
+
+    with open(os.path.join(directory, f"{name}.tb"), "wb") as file:
+        file.write(MAGIC)
+        file.write(values)
+
+    wins = sum(1 for value in values if value % 2 == 0 and value)
+    losses = sum(1 for value in values if value % 2 == 1)
+    longest = max(values) - 1
+    print(
+        f"{name}: {size} positions, {wins} wins, {losses} losses, "
+        f"longest mate {longest} plies, {round(time.perf_counter() - start_time, 1)}s"
+    )
+
+
+def generate_all(names: list[str], directory: str, tablebases: Tablebases) -> None:
+    for name in names:
+        name = canonical_name(*split_name(name))
+        if os.path.exists(os.path.join(directory, f"{name}.tb")):
+            continue
+
+        # the endgames this one can turn into are made first
+        generate_all(sorted(dependencies(name)), directory, tablebases)
+
+        generate(name, directory, tablebases)
+
+        # let the next endgames look this one up
+        tablebases.max_pieces = max(tablebases.max_pieces, len(name))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Make endgame tablebases by retrograde analysis."
+    )
+    parser.add_argument(
+        "endgames", nargs="*", default=DEFAULT_ENDGAMES, help="such as KQK or KRKP"
+    )
+    parser.add_argument("--directory", default="tablebases")
+    args = parser.parse_args()
+
+    os.makedirs(args.directory, exist_ok=True)
+    tablebases = Tablebases(args.directory)
+    generate_all(args.endgames, args.directory, tablebases)
+    tablebases.close()
+
+
+if __name__ == "__main__":
+    main()
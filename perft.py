@@ -0,0 +1,154 @@
+import argparse
+import json
+import sys
+import time
+from core.backends import BACKENDS
+from core.board import Board
+from core.bitboard import BitBoard
+from core.instrument import Profiler
+
+
+def perft(board: Board | BitBoard, depth: int) -> int:
+    moves = board.get_legal_moves()
+
+    # count the moves directly at the last depth
+    if depth == 1:
+        return len(moves)
+
+    nodes = 0
+    for move in moves:
+        board.push(move)
+        nodes += perft(board, depth - 1)
+        board.pop()
+
+    return nodes
+
+
+def divide(board: Board | BitBoard, depth: int) -> dict[str, int]:
+    # count the nodes under each root move
+    counts = {}
+    for move in board.get_legal_moves():
+        board.push(move)
+        counts[move.to_uci()] = perft(board, depth - 1) if depth > 1 else 1
+        board.pop()
+
+    return counts
+
+
+def load_positions(path: str) -> list[tuple[str, dict[int, int]]]:
+    positions = []
+
+    # each line is a fen followed by the expected counts, such as ;D1 20 ;D2 400
+    with open(path) as file:
+        for line in file:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+
+            fen, *fields = line.split(";")
+            expected = {}
+            for field in fields:
+                name, count = field.split()
+                expected[int(name[1:])] = int(count)
+
+            positions.append((fen.strip(), expected))
+
+    return positions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Count and time move generation.")
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--fen-file", default="positions/perft.epd")
+    parser.add_argument("--fen", help="a single position to run instead of the file")
+    parser.add_argument("--backend", choices=BACKENDS, default="list")
+    parser.add_argument("--divide", action="store_true")
+    parser.add_argument("--json", help="write a report to this file")
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="profile.folded",
+        help="time each phase and write a flame graph to this file",
+    )
+    args = parser.parse_args()
+
+    if args.fen:
+        positions = [(args.fen, {})]
+    else:
+        positions = load_positions(args.fen_file)
+
+    results = []
+    passed = True
+
+    profiler = Profiler() if args.profile else None
+    if profiler:
+        profiler.start()
+
+    for fen, expected in positions:
+        board = BACKENDS[args.backend].from_fen(fen)
+        print(fen)
+
+        if args.divide:
+            for move, count in divide(board, args.depth).items():
+                print(f"  {move}: {count}")
+
+        # run every depth up to the chosen depth
+        for depth in range(1, args.depth + 1):
+            start_time = time.perf_counter()
+            nodes = perft(board, depth)
+            elapsed = time.perf_counter() - start_time
+
+            correct = expected.get(depth, nodes) == nodes
+            passed = passed and correct
+            nps = round(nodes / max(elapsed, 1e-9))
+
+            status = "ok" if correct else f"FAIL (expected {expected[depth]})"
+            if depth not in expected:
+                status = "unchecked"
+            print(
+                f"  depth {depth}: {nodes} nodes, {round(elapsed, 3)}s, {nps} nps, {status}"
+            )
+
+            results.append(
+                {
+                    "fen": fen,
+                    "depth": depth,
+                    "nodes": nodes,
+                    "expected": expected.get(depth),
+                    "time": elapsed,
+                    "nps": nps,
+                    "passed": correct,
+                }
+            )
+
+    if profiler:
+        profiler.stop()
+        print(profiler.report())
+        profiler.write_flamegraph(args.profile)
+
+    total_nodes = sum(result["nodes"] for result in results)
+    total_time = sum(result["time"] for result in results)
+    total_nps = round(total_nodes / max(total_time, 1e-9))
+    print(f"Total: {total_nodes} nodes, {round(total_time, 3)}s, {total_nps} nps")
+
+    if args.json:
+        report = {
+            "backend": args.backend,
+            "depth": args.depth,
+            "nodes": total_nodes,
+            "time": total_time,
+            "nps": total_nps,
+            "passed": passed,
+            "results": results,
+        }
+        with open(args.json, "w") as file:
+            json.dump(report, file, indent=2)
+
+    # fail if any count is wrong
+    if not passed:
+        print("Perft FAILED")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
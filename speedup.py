@@ -0,0 +1,68 @@
+import argparse
+import os
+import time
+from core.backends import BACKENDS
+from core.engine import Engine
+
+# middlegame positions to time the search on
+POSITIONS = [
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+    "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+    "r1bq1rk1/pp2bppp/2n1pn2/3p4/2PP4/2N1PN2/PP2BPPP/R2QKB1R w KQ - 0 8",
+]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Time the parallel search to a fixed depth for each worker count."
+    )
+    parser.add_argument("--depth", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--backend", choices=BACKENDS, default="list")
+    args = parser.parse_args()
+
+    base_time = None
+    base_nodes = None
+
+    # the workers only run at the same time with a core for each of them
+    cores = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else None
+    if cores is None:
+        cores = os.cpu_count() or 1
+    if cores < args.workers:
+        print(f"{args.workers} workers on {cores} cores, so the speedup is limited")
+
+    for workers in range(1, args.workers + 1):
+        engine = Engine(workers=workers, verbose=False)
+        total_time = 0.0
+        total_nodes = 0
+
+        for fen in POSITIONS:
+            # clear the transposition tables, restarting the workers to clear theirs too
+            engine.tt.clear()
+            if workers > 1:
+                engine.stop_workers()
+                engine.start_workers()
+            board = BACKENDS[args.backend].from_fen(fen)
+
+            start_time = time.perf_counter()
+            engine.search(board, max_time=1e9, max_depth=args.depth)
+            total_time += time.perf_counter() - start_time
+            total_nodes += engine.nodes
+
+        engine.close()
+
+        if base_time is None:
+            base_time = total_time
+            base_nodes = total_nodes
+
+        # the extra nodes searched since the workers don't share their tables
+        extra = round((total_nodes / base_nodes - 1) * 100, 1)
+        print(
+            f"Workers: {workers}, Time to Depth {args.depth}: {round(total_time, 3)}s, "
+            f"Nodes: {total_nodes} (+{extra}%), "
+            f"Speedup: {round(base_time / total_time, 2)}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
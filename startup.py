@@ -0,0 +1,59 @@
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from core.backends import BACKENDS
+
+# run in a fresh interpreter so nothing is already imported
+CHILD = """
+import json, sys, time
+start = time.perf_counter()
+from core.backends import BACKENDS
+from core.engine import Engine
+from core.fen import START_FEN
+imported = time.perf_counter()
+engine = Engine(verbose=False)
+engine.search(BACKENDS[sys.argv[1]].from_fen(START_FEN), 1e9, int(sys.argv[2]))
+searched = time.perf_counter()
+print(json.dumps({"import": imported - start, "search": searched - imported}))
+"""
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Time starting a new process, importing the engine and its first search."
+    )
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--backend", choices=BACKENDS, default="list")
+    args = parser.parse_args()
+
+    totals, imports, searches = [], [], []
+
+    for run in range(args.runs):
+        start_time = time.perf_counter()
+        output = subprocess.run(
+            [sys.executable, "-c", CHILD, args.backend, str(args.depth)],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        totals.append(time.perf_counter() - start_time)
+
+        times = json.loads(output)
+        imports.append(times["import"])
+        searches.append(times["search"])
+
+    # the median ignores runs slowed down by something else on the machine
+    print(f"Process Start to Move: {round(statistics.median(totals) * 1000, 1)}ms")
+    print(f"Import: {round(statistics.median(imports) * 1000, 1)}ms")
+    print(
+        f"First Search to Depth {args.depth}: "
+        f"{round(statistics.median(searches) * 1000, 1)}ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import time
+from core.backends import BACKENDS
+from core.engine import Engine
+from core.rules import game_result, WHITE_WIN, DRAW
+
+# the settings an engine can be given, and how to read them
+SETTINGS = {"hash_size": int, "replacement": str, "time": float, "depth": int}
+
+
+def parse_config(text: str, move_time: float) -> dict:
+    # settings are written as key=value pairs, such as hash_size=32,replacement=always
+    config = {"hash_size": 16, "replacement": "depth", "time": move_time, "depth": 64}
+
+    for pair in filter(None, text.split(",")):
+        key, value = pair.split("=")
+        if key not in SETTINGS:
+            raise ValueError(f"Unknown engine setting: {key}")
+        config[key] = SETTINGS[key](value)
+
+    return config
+
+
+def load_openings(path: str) -> list[tuple[str, str]]:
+    openings = []
+
+    # each line is a fen followed by a name, such as ;id Ruy Lopez
+    with open(path) as file:
+        for line in file:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+
+            fen, *fields = line.split(";")
+            name = fen.strip()
+            for field in fields:
+                if field.startswith("id "):
+                    name = field[3:].strip()
+
+            openings.append((fen.strip(), name))
+
+    return openings
+
+
+def play_game(
+    game: int, fen: str, name: str, white: str, configs: dict[str, dict], backend: str
+) -> dict:
+    board = BACKENDS[backend].from_fen(fen)
+    black = "B" if white == "A" else "A"
+    players = {True: white, False: black}
+
+    # each game starts with empty tables so games don't depend on each other
+    engines = {
+        player: Engine(config["hash_size"], config["replacement"], verbose=False)
+        for player, config in configs.items()
+    }
+    nodes = {"A": 0, "B": 0}
+    times = {"A": 0.0, "B": 0.0}
+    moves = []
+
+    while (result := game_result(board)) is None:
+        player = players[board.white_to_move]
+        config = configs[player]
+
+        start_time = time.perf_counter()
+        move = engines[player].search(board, config["time"], config["depth"])
+        times[player] += time.perf_counter() - start_time
+        nodes[player] += engines[player].nodes
+
+        board.push(move)
+        moves.append(move.to_uci())
+
+    outcome, reason = result
+
+    # the score is from engine A's point of view
+    if outcome == DRAW:
+        score = 0.5
+    else:
+        score = 1.0 if (outcome == WHITE_WIN) == (white == "A") else 0.0
+
+    return {
+        "game": game,
+        "opening": name,
+        "fen": fen,
+        "white": white,
+        "black": black,
+        "result": outcome,
+        "reason": reason,
+        "score": score,
+        "plies": len(moves),
+        "moves": moves,
+        "nodes": nodes,
+        "time": {player: round(seconds, 3) for player, seconds in times.items()},
+    }
+
+
+def elo(score: float) -> float:
+    # the rating difference expected to give this score, a score of 0 or 1 is unbounded
+    score = min(max(score, 1e-6), 1 - 1e-6)
+    return -400 * math.log10(1 / score - 1)
+
+
+def elo_estimate(scores: list[float]) -> tuple[float, float, float]:
+    # the elo difference and a 95% confidence interval from the spread of the scores
+    mean = sum(scores) / len(scores)
+    variance = sum((score - mean) ** 2 for score in scores) / len(scores)
+    margin = 1.96 * math.sqrt(variance / len(scores))
+
+    return elo(mean), elo(mean - margin), elo(mean + margin)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Play two engine configurations against each other."
+    )
+    parser.add_argument("--games", type=int, default=20)
+    parser.add_argument("--time", type=float, default=0.1, help="seconds per move")
+    parser.add_argument("--engine-a", default="", help="such as hash_size=32,time=0.2")
+    parser.add_argument("--engine-b", default="", help="such as replacement=always")
+    parser.add_argument("--openings", default="positions/openings.epd")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--backend", choices=BACKENDS, default="list")
+    parser.add_argument("--output", default="tournament.jsonl")
+    args = parser.parse_args()
+
+    configs = {
+        "A": parse_config(args.engine_a, args.time),
+        "B": parse_config(args.engine_b, args.time),
+    }
+    openings = load_openings(args.openings)
+
+    # each opening is played twice so both engines get each side of it
+    jobs = []
+    for game in range(args.games):
+        fen, name = openings[game // 2 % len(openings)]
+        white = "A" if game % 2 == 0 else "B"
+        jobs.append((game, fen, name, white, configs, args.backend))
+
+    scores = []
+    nodes = {"A": 0, "B": 0}
+    times = {"A": 0.0, "B": 0.0}
+
+    # write each result as soon as its game is over, in whatever order they finish
+    with multiprocessing.Pool(args.workers) as pool, open(args.output, "w") as output:
+        for result in pool.imap_unordered(play_job, jobs):
+            output.write(json.dumps(result) + "\n")
+            output.flush()
+
+            scores.append(result["score"])
+            for player in ("A", "B"):
+                nodes[player] += result["nodes"][player]
+                times[player] += result["time"][player]
+
+            print(
+                f"Game {result['game'] + 1}: {result['white']} vs {result['black']}, "
+                f"{result['result']} by {result['reason']} ({result['opening']})"
+            )
+
+    # wins, losses and draws for engine A
+    wins, losses, draws = scores.count(1.0), scores.count(0.0), scores.count(0.5)
+    score = sum(scores)
+    difference, lower, upper = elo_estimate(scores)
+
+    print(f"\nScore of A vs B: {wins} - {losses} - {draws}")
+    print(f"Score: {score}/{len(scores)} ({round(score / len(scores) * 100, 1)}%)")
+    print(
+        f"Elo Difference: {round(difference, 1)} ({round(lower, 1)}, {round(upper, 1)})"
+    )
+    for player in ("A", "B"):
+        nps = round(nodes[player] / max(times[player], 1e-9))
+        print(f"Engine {player} Nodes per Second: {nps}")
+
+
+def play_job(job: tuple) -> dict:
+    # the pool passes one argument to each job
+    return play_game(*job)
+
+
+if __name__ == "__main__":
+    main()
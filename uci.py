@@ -0,0 +1,285 @@
+import argparse
+import sys
+import threading
+from core.backends import BACKENDS
+from core.board import Board
+from core.bitboard import BitBoard
+from core.engine import Engine, MATE_BOUND
+from core.fen import START_FEN
+from core.stats import SearchStats
+from core.instrument import Profiler
+from core.move import Move
+from core.constants import INFINITY
+
+NAME = "Chess"
+AUTHOR = "AgentAndrew"
+
+# the moves left to plan for when the gui doesn't send movestogo
+MOVES_TO_GO = 30
+
+# time kept back for reading commands and sending the move, in seconds
+MOVE_OVERHEAD = 0.05
+
+
+class UCI:
+    def __init__(
+        self,
+        backend: str = "list",
+        book: str | None = None,
+        tablebases: str | None = None,
+    ) -> None:
+        self.backend = BACKENDS[backend]
+        self.book = book
+        self.tablebases = tablebases
+        self.hash_size = 16
+        self.threads = 1
+        self.engine = self.create_engine()
+        self.board = self.backend.from_fen(START_FEN)
+
+        self.search_thread = None
+
+        # infinite and ponder searches wait for stop or ponderhit to send their move
+        self.released = threading.Event()
+
+    def create_engine(self) -> Engine:
+        engine = Engine(
+            self.hash_size,
+            workers=self.threads,
+            verbose=False,
+            book=self.book,
+            tablebases=self.tablebases,
+        )
+        engine.add_callback(self.send_info)
+
+        # fork the workers here, a fork from the search thread can deadlock on stdin
+        if self.threads > 1:
+            engine.start_workers()
+
+        return engine
+
+    def send(self, line: str) -> None:
+        sys.stdout.write(line + "\n")
+        sys.stdout.flush()
+
+    def run(self) -> None:
+        for line in sys.stdin:
+            tokens = line.split()
+            if not tokens:
+                continue
+
+            command, args = tokens[0], tokens[1:]
+            if command == "quit":
+                break
+
+            if command == "uci":
+                self.send(f"id name {NAME}")
+                self.send(f"id author {AUTHOR}")
+                self.send("option name Hash type spin default 16 min 1 max 1024")
+                self.send("option name Threads type spin default 1 min 1 max 64")
+                self.send("option name Ponder type check default false")
+                self.send("uciok")
+            elif command == "isready":
+                self.send("readyok")
+            elif command == "setoption":
+                self.set_option(args)
+            elif command == "ucinewgame":
+                self.wait()
+                self.engine.tt.clear()
+            elif command == "position":
+                self.set_position(args)
+            elif command == "go":
+                self.go(args)
+            elif command == "stop":
+                self.stop()
+            elif command == "ponderhit":
+                self.engine.ponder_hit()
+                self.released.set()
+
+        self.stop()
+        self.engine.close()
+
+    def set_option(self, args: list[str]) -> None:
+        # options are sent as: name <name> value <value>
+        if "name" not in args or "value" not in args:
+            return
+
+        name = " ".join(args[args.index("name") + 1 : args.index("value")]).lower()
+        value = " ".join(args[args.index("value") + 1 :])
+
+        self.wait()
+        if name == "hash":
+            self.hash_size = max(1, int(value))
+            self.engine.hash_size = self.hash_size
+            self.engine.tt.resize(self.hash_size)
+
+            # the workers are started again with the new table size
+            self.engine.stop_workers()
+            if self.threads > 1:
+                self.engine.start_workers()
+        elif name == "threads":
+            self.threads = max(1, int(value))
+            self.engine.close()
+            self.engine = self.create_engine()
+
+    def set_position(self, args: list[str]) -> None:
+        self.wait()
+
+        # position [startpos | fen <fen>] [moves <move> ...]
+        if "moves" in args:
+            moves = args[args.index("moves") + 1 :]
+            args = args[: args.index("moves")]
+        else:
+            moves = []
+
+        if args and args[0] == "fen":
+            self.board = self.backend.from_fen(" ".join(args[1:]))
+        else:
+            self.board = self.backend.from_fen(START_FEN)
+
+        for notation in moves:
+            move = find_move(self.board, notation)
+            if move is None:
+                self.send(f"info string illegal move {notation}")
+                break
+            self.board.push(move)
+
+    def go(self, args: list[str]) -> None:
+        self.wait()
+
+        # read the search limits, times are in milliseconds
+        limits = {}
+        flags = set()
+        for i, arg in enumerate(args):
+            if arg in ("infinite", "ponder"):
+                flags.add(arg)
+            elif i + 1 < len(args) and args[i + 1].lstrip("-").isdigit():
+                limits[arg] = int(args[i + 1])
+
+        max_depth = limits.get("depth", 64)
+        max_time = self.allocate_time(limits)
+
+        # infinite searches use the engine's ponder mode, which has no time limit
+        ponder = bool(flags)
+        self.released.clear()
+        if not ponder:
+            self.released.set()
+
+        self.search_thread = threading.Thread(
+            target=self.search,
+            args=(self.board.copy(), max_time, max_depth, ponder),
+            daemon=True,
+        )
+        self.search_thread.start()
+
+    def allocate_time(self, limits: dict[str, int]) -> float:
+        if "movetime" in limits:
+            return max(limits["movetime"] / 1000 - MOVE_OVERHEAD, 0.01)
+
+        # use a share of the remaining time and most of the increment
+        side = "w" if self.board.white_to_move else "b"
+        if f"{side}time" in limits:
+            remaining = limits[f"{side}time"] / 1000
+            increment = limits.get(f"{side}inc", 0) / 1000
+            moves_to_go = limits.get("movestogo", MOVES_TO_GO)
+
+            max_time = remaining / moves_to_go + increment * 3 / 4
+            return max(min(max_time, remaining / 2) - MOVE_OVERHEAD, 0.01)
+
+        # only a depth, or no limit at all
+        return float("inf")
+
+    def search(
+        self, board: Board | BitBoard, max_time: float, max_depth: int, ponder: bool
+    ) -> None:
+        move = self.engine.search(board, max_time, max_depth, ponder)
+
+        # a finished infinite search still waits to be told to stop
+        self.released.wait()
+
+        if move is None:
+            self.send("bestmove 0000")
+        elif self.engine.ponder_move is not None:
+            self.send(
+                f"bestmove {move.to_uci()} ponder {self.engine.ponder_move.to_uci()}"
+            )
+        else:
+            self.send(f"bestmove {move.to_uci()}")
+
+    def send_info(self, event: str, stats: SearchStats) -> None:
+        # report each completed depth
+        if event != "iteration":
+            return
+
+        pv = " ".join(move.to_uci() for move in stats.pv)
+        self.send(
+            f"info depth {stats.depth} score {format_score(stats.eval)} "
+            f"nodes {stats.nodes} nps {stats.nps} time {round(stats.time * 1000)} "
+            f"pv {pv}"
+        )
+
+    def stop(self) -> None:
+        self.released.set()
+
+        # keep stopping until the thread ends, the search resets the flag when it starts
+        while self.search_thread is not None and self.search_thread.is_alive():
+            self.engine.stop()
+            self.search_thread.join(0.01)
+
+    def wait(self) -> None:
+        # let a timed search finish before changing the position or options
+        if self.search_thread is not None:
+            if not self.released.is_set():
+                self.stop()
+            self.search_thread.join()
+            self.search_thread = None
+
+
+def find_move(board: Board | BitBoard, notation: str) -> Move | None:
+    # match the notation against the legal moves, so castling and en passant are known
+    for move in board.get_legal_moves():
+        if move.to_uci() == notation:
+            return move
+
+    return None
+
+
+def format_score(eval: int) -> str:
+    # mates are sent as the number of moves until mate
+    if abs(eval) >= MATE_BOUND:
+        plies = INFINITY - abs(eval)
+        moves = (plies + 1) // 2
+        return f"mate {moves if eval > 0 else -moves}"
+
+    return f"cp {eval}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Run the engine with the UCI protocol on stdin and stdout."
+    )
+    parser.add_argument("--backend", choices=BACKENDS, default="list")
+    parser.add_argument("--book", help="an opening book made by makebook.py")
+    parser.add_argument("--tablebases", help="a folder made by maketables.py")
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="profile.folded",
+        help="time each phase and write a flame graph to this file",
+    )
+    args = parser.parse_args()
+
+    profiler = Profiler() if args.profile else None
+    if profiler:
+        profiler.start()
+
+    UCI(args.backend, args.book, args.tablebases).run()
+
+    # stdout is for the protocol, so the report goes to stderr
+    if profiler:
+        profiler.stop()
+        print(profiler.report(), file=sys.stderr)
+        profiler.write_flamegraph(args.profile)
+
+
+if __name__ == "__main__":
+    main()